@@ -1,16 +1,31 @@
-from typing import Generator, Optional
+import threading
+from typing import Annotated, Generator, Optional
+from cachetools import TTLCache
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, raiseload
 
 from app.db.session import SessionLocal
 from app.core.config import settings
 from app.core.security import decode_access_token
 from app.models.user import User
+from app.schemas.user import AuthenticatedUser
 
 # JWT Bearer token security
 security = HTTPBearer(auto_error=False)
 
+# Short-lived cache for the auth hot path: user rows change rarely, so repeat
+# requests can skip the users lookup (token decodes are cached in security).
+# Writes to a user row call invalidate_user_cache; otherwise (e.g. another
+# worker or a manual DB edit) profile fields and is_active can be up to 30s stale.
+_user_cache = TTLCache(maxsize=10_000, ttl=30)  # user_id -> AuthenticatedUser
+_cache_lock = threading.Lock()
+
+# No endpoint reads User relationships off the auth dependency, so nothing is
+# eager-loaded. Outside production, any accidental lazy load raises instead of
+# silently adding per-request SELECTs.
+_USER_LOAD_OPTIONS = () if settings.is_production else (raiseload("*"),)
+
 
 def get_db() -> Generator:
     """Database dependency"""
@@ -21,10 +36,41 @@ def get_db() -> Generator:
         db.close()
 
 
+def _get_active_user(db: Session, user_id: int) -> Optional[AuthenticatedUser]:
+    """
+    Load an active user, serving from the snapshot cache when possible.
+
+    Returns a frozen AuthenticatedUser (profile columns, no password hash)
+    rather than an ORM instance, so nothing can lazy-load or write through it.
+    It may be up to 30 seconds stale; see _user_cache.
+    """
+    with _cache_lock:
+        snapshot = _user_cache.get(user_id)
+    if snapshot:
+        return snapshot
+
+    # Primary-key lookup goes through the identity map before hitting the DB
+    user = db.get(User, user_id, options=_USER_LOAD_OPTIONS)
+    if user is None or not user.is_active:
+        return None
+
+    snapshot = AuthenticatedUser.model_validate(user)
+    with _cache_lock:
+        _user_cache[user_id] = snapshot
+
+    return snapshot
+
+
+def invalidate_user_cache(user_id: int) -> None:
+    """Drop a user's cached snapshot after their row changes."""
+    with _cache_lock:
+        _user_cache.pop(user_id, None)
+
+
 async def get_current_user(
     credentials: Optional[HTTPAuthorizationCredentials] = Depends(security),
     db: Session = Depends(get_db)
-) -> User:
+) -> AuthenticatedUser:
     """
     Get current authenticated user from JWT token.
 
@@ -33,7 +79,7 @@ async def get_current_user(
         db: Database session
 
     Returns:
-        Authenticated User object
+        Read-only snapshot of the authenticated user
 
     Raises:
         HTTPException: If not authenticated or token is invalid
@@ -53,10 +99,7 @@ async def get_current_user(
             headers={"WWW-Authenticate": "Bearer"}
         )
 
-    user = db.query(User).filter(
-        User.id == user_id,
-        User.is_active == True
-    ).first()
+    user = _get_active_user(db, user_id)
 
     if not user:
         raise HTTPException(
@@ -67,14 +110,19 @@ async def get_current_user(
     return user
 
 
-async def get_current_user_id(
-    user: User = Depends(get_current_user)
-) -> int:
+# Authenticated user for endpoint signatures; FastAPI caches the dependency
+# per request, so this and get_current_user_id resolve the user only once.
+CurrentUser = Annotated[AuthenticatedUser, Depends(get_current_user)]
+
+
+async def get_current_user_id(user: CurrentUser) -> int:
     """
     Get current user ID from authenticated user.
 
     This maintains backward compatibility with existing endpoints
-    that use get_current_user_id dependency.
+    that use get_current_user_id dependency. It is a plain attribute read
+    on the already-resolved user, declared async so it never hops to the
+    threadpool.
 
     Args:
         user: Authenticated user from get_current_user
@@ -88,7 +136,7 @@ async def get_current_user_id(
 async def get_optional_user(
     credentials: Optional[HTTPAuthorizationCredentials] = Depends(security),
     db: Session = Depends(get_db)
-) -> Optional[User]:
+) -> Optional[AuthenticatedUser]:
     """
     Get user if authenticated, None otherwise.
 
@@ -99,7 +147,7 @@ async def get_optional_user(
         db: Database session
 
     Returns:
-        User object if authenticated, None otherwise
+        Read-only user snapshot if authenticated, None otherwise
     """
     if not credentials:
         return None
@@ -108,7 +156,4 @@ async def get_optional_user(
     if not user_id:
         return None
 
-    return db.query(User).filter(
-        User.id == user_id,
-        User.is_active == True
-    ).first()
+    return _get_active_user(db, user_id)
@@ -3,6 +3,7 @@ from sqlalchemy.orm import Session
 from typing import List
 
 from app.api.deps import get_db, get_current_user_id
+from app.core import cache
 from app.models.account import Account
 from app.schemas.account import AccountResponse, AccountCreate
 
@@ -15,8 +16,17 @@ def get_accounts(
     user_id: int = Depends(get_current_user_id)
 ):
     """Get all accounts for current user"""
-    accounts = db.query(Account).filter(Account.user_id == user_id).all()
-    return accounts
+    # Read-only listing: select plain columns to skip ORM instance hydration
+    return cache.get_or_set("accounts", user_id, lambda: db.query(
+        Account.id,
+        Account.user_id,
+        Account.name,
+        Account.institution,
+        Account.account_type,
+        Account.account_number_last4,
+        Account.currency,
+        Account.created_at
+    ).filter(Account.user_id == user_id).all())
 
 
 @router.get("/{account_id}", response_model=AccountResponse)
@@ -50,5 +60,6 @@ def create_account(
     )
     db.add(db_account)
     db.commit()
-    db.refresh(db_account)
+    cache.invalidate("accounts", user_id)
+    cache.invalidate("dashboard", user_id)
     return db_account
@@ -1,12 +1,9 @@
-import asyncio
 import logging
-from concurrent.futures import ThreadPoolExecutor
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
-from typing import List
+from sqlalchemy import func, case
 
 from app.api.deps import get_db, get_current_user_id
-from app.db.session import SessionLocal
 from app.schemas.merchant_cache import (
     CategorizeMerchantRequest,
     CategorizeMerchantResponse,
@@ -24,74 +21,14 @@ from datetime import date
 logger = logging.getLogger("categorization")
 router = APIRouter()
 
-# Thread pool for AI operations - prevents blocking the event loop
-ai_executor = ThreadPoolExecutor(max_workers=3)
-
-
-def _run_categorize_merchant_sync(merchant_key: str, sample_descriptions: List[str], user_id: int):
-    """Run merchant categorization in a background thread."""
-    db = SessionLocal()
-    try:
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        try:
-            result = loop.run_until_complete(
-                categorize_merchant_with_ai(
-                    merchant_key=merchant_key,
-                    sample_descriptions=sample_descriptions,
-                    db=db,
-                    user_id=user_id
-                )
-            )
-            return result
-        finally:
-            loop.close()
-    finally:
-        db.close()
-
-
-def _run_insights_sync(aggregates: dict, sample_transactions: list, filters: dict):
-    """Run insights generation in a background thread."""
-    loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(loop)
-    try:
-        result = loop.run_until_complete(
-            generate_insights_with_ai(
-                aggregates=aggregates,
-                sample_transactions=sample_transactions,
-                filters=filters
-            )
-        )
-        return result
-    finally:
-        loop.close()
-
-
-def _run_batch_categorize_sync(transaction_ids: List[int], user_id: int, auto_apply: bool):
-    """Run batch categorization in a background thread."""
-    db = SessionLocal()
-    try:
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        try:
-            result = loop.run_until_complete(
-                categorize_transactions_batch(
-                    transaction_ids=transaction_ids,
-                    db=db,
-                    user_id=user_id,
-                    auto_apply=auto_apply
-                )
-            )
-            return result
-        finally:
-            loop.close()
-    finally:
-        db.close()
+# The AI endpoints block on database queries and AI API requests, so they are
+# plain functions, which FastAPI runs in its threadpool off the event loop.
 
 
 @router.post("/categorize_merchant", response_model=CategorizeMerchantResponse)
-async def categorize_merchant(
+def categorize_merchant(
     request: CategorizeMerchantRequest,
+    db: Session = Depends(get_db),
     user_id: int = Depends(get_current_user_id)
 ):
     """
@@ -99,16 +36,13 @@ async def categorize_merchant(
 
     Returns cached result if available, otherwise calls LLM and caches the result.
     Also updates all uncategorized transactions for this merchant.
-    Runs in background thread to avoid blocking other requests.
     """
     try:
-        loop = asyncio.get_event_loop()
-        result = await loop.run_in_executor(
-            ai_executor,
-            _run_categorize_merchant_sync,
-            request.merchant_key,
-            request.sample_descriptions,
-            user_id
+        result = categorize_merchant_with_ai(
+            merchant_key=request.merchant_key,
+            sample_descriptions=request.sample_descriptions,
+            db=db,
+            user_id=user_id
         )
 
         return CategorizeMerchantResponse(**result)
@@ -119,7 +53,7 @@ async def categorize_merchant(
 
 
 @router.post("/insights", response_model=InsightsResponse)
-async def get_insights(
+def get_insights(
     request: InsightsRequest,
     db: Session = Depends(get_db),
     user_id: int = Depends(get_current_user_id)
@@ -162,42 +96,53 @@ async def get_insights(
         if request.max_amount is not None:
             query = query.filter(Transaction.amount <= request.max_amount)
 
-        # Get all filtered transactions
-        transactions = query.all()
-
-        # Compute aggregates
-        total_spent = sum(t.amount for t in transactions if t.amount < 0)
-        total_income = sum(t.amount for t in transactions if t.amount > 0)
+        # Compute aggregates in SQL so only O(#categories) rows come back.
+        # A single grouped scan yields each category's net plus its spent/income
+        # split; the overall totals are summed from those rows in one pass.
+        category_rows = query.with_entities(
+            Transaction.category,
+            func.sum(Transaction.amount).label("net"),
+            func.sum(case((Transaction.amount < 0, Transaction.amount), else_=0)).label("spent"),
+            func.sum(case((Transaction.amount > 0, Transaction.amount), else_=0)).label("income")
+        ).group_by(Transaction.category).all()
 
         by_category = {}
-        for t in transactions:
-            by_category[t.category] = by_category.get(t.category, 0) + t.amount
+        total_spent = 0.0
+        total_income = 0.0
+        for row in category_rows:
+            by_category[row.category] = row.net
+            total_spent += row.spent
+            total_income += row.income
 
         aggregates = {
-            "total_spent": total_spent,
-            "total_income": total_income,
+            "total_spent": float(total_spent),
+            "total_income": float(total_income),
             "by_category": by_category
         }
 
-        # Sample transactions for context
+        # Sample of the most recent transactions for context
+        sample_rows = query.with_entities(
+            Transaction.date,
+            Transaction.description_raw,
+            Transaction.amount,
+            Transaction.category
+        ).order_by(Transaction.date.desc()).limit(10).all()
+
         sample_transactions = [
             {
-                "date": t.date.isoformat(),
-                "description": t.description_raw,
-                "amount": t.amount,
-                "category": t.category
+                "date": row.date.isoformat(),
+                "description": row.description_raw,
+                "amount": row.amount,
+                "category": row.category
             }
-            for t in transactions[:10]
+            for row in sample_rows
         ]
 
-        # Generate insights with AI in background thread
-        loop = asyncio.get_event_loop()
-        insights = await loop.run_in_executor(
-            ai_executor,
-            _run_insights_sync,
-            aggregates,
-            sample_transactions,
-            request.model_dump()
+        # Generate insights with AI
+        insights = generate_insights_with_ai(
+            aggregates=aggregates,
+            sample_transactions=sample_transactions,
+            filters=request.model_dump()
         )
 
         return InsightsResponse(insights=insights)
@@ -232,8 +177,9 @@ def get_available_categories(
 
 
 @router.post("/categorize_batch", response_model=BatchCategorizationResponse)
-async def categorize_batch(
+def categorize_batch(
     request: BatchCategorizationRequest,
+    db: Session = Depends(get_db),
     user_id: int = Depends(get_current_user_id)
 ):
     """
@@ -241,7 +187,6 @@ async def categorize_batch(
 
     Categorizes multiple transactions at once using AI analysis of merchant names and amounts.
     Uses cached results when available to minimize API calls.
-    Runs in background thread to avoid blocking other requests.
 
     Parameters:
     - transaction_ids: List of transaction IDs to categorize
@@ -268,13 +213,11 @@ async def categorize_batch(
     ```
     """
     try:
-        loop = asyncio.get_event_loop()
-        result = await loop.run_in_executor(
-            ai_executor,
-            _run_batch_categorize_sync,
-            request.transaction_ids,
-            user_id,
-            request.auto_apply
+        result = categorize_transactions_batch(
+            transaction_ids=request.transaction_ids,
+            db=db,
+            user_id=user_id,
+            auto_apply=request.auto_apply
         )
 
         return BatchCategorizationResponse(**result)
@@ -2,11 +2,18 @@
 Authentication endpoints for user signup, login, and Google OAuth.
 """
 
+import asyncio
+from functools import lru_cache
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 
-from app.api.deps import get_db, get_current_user
-from app.core.security import verify_password, get_password_hash, create_access_token
+from app.api.deps import get_db, CurrentUser, invalidate_user_cache
+from app.core.security import (
+    verify_password,
+    verify_and_update_password,
+    get_password_hash,
+    create_access_token
+)
 from app.models.user import User
 from app.schemas.auth import (
     SignupRequest,
@@ -25,6 +32,20 @@ from app.services.google_oauth import (
 
 router = APIRouter()
 
+@lru_cache(maxsize=1)
+def _dummy_hash() -> str:
+    """
+    Hash verified against when the email is unknown, so failed logins cost the
+    same bcrypt round whether or not the account exists. Built on first use so
+    startup doesn't pay for a bcrypt hash.
+    """
+    return get_password_hash("dummy")
+
+
+def _verify_dummy_password(password: str) -> None:
+    """Run a throwaway bcrypt verify; called in a worker thread like real verifies."""
+    verify_password(password, _dummy_hash())
+
 
 @router.post("/signup", response_model=AuthResponse)
 async def signup(
@@ -46,17 +67,19 @@ async def signup(
             detail="Email already registered"
         )
 
+    # Hash off the event loop; bcrypt is deliberately slow
+    hashed_password = await asyncio.to_thread(get_password_hash, data.password)
+
     # Create new user
     user = User(
         email=data.email,
-        hashed_password=get_password_hash(data.password),
+        hashed_password=hashed_password,
         name=data.name,
         is_active=True,
         is_demo=False
     )
     db.add(user)
     db.commit()
-    db.refresh(user)
 
     # Generate JWT token
     token = create_access_token(user.id)
@@ -81,25 +104,36 @@ async def login(
     user = db.query(User).filter(User.email == data.email).first()
 
     if not user or not user.hashed_password:
+        # Burn a comparable bcrypt round so response time doesn't reveal the email
+        await asyncio.to_thread(_verify_dummy_password, data.password)
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid email or password"
         )
 
-    # Verify password
-    if not verify_password(data.password, user.hashed_password):
+    # Disabled accounts are rejected before paying for bcrypt
+    if not user.is_active:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid email or password"
         )
 
-    # Check if user is active
-    if not user.is_active:
+    # Verify password (bcrypt runs in the default executor)
+    valid, new_hash = await asyncio.to_thread(
+        verify_and_update_password, data.password, user.hashed_password
+    )
+    if not valid:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Account is disabled"
+            detail="Invalid email or password"
         )
 
+    # Stored hash was made at a different bcrypt cost; store one at the current cost
+    if new_hash:
+        user.hashed_password = new_hash
+        db.commit()
+        invalidate_user_cache(user.id)
+
     # Generate JWT token
     token = create_access_token(user.id)
 
@@ -165,7 +199,7 @@ async def google_auth(
             db.add(user)
 
         db.commit()
-        db.refresh(user)
+        invalidate_user_cache(user.id)
 
     # Check if user is active
     if not user.is_active:
@@ -202,9 +236,7 @@ async def get_google_oauth_url():
 
 
 @router.get("/me", response_model=UserAuthResponse)
-async def get_me(
-    user: User = Depends(get_current_user)
-):
+async def get_me(user: CurrentUser):
     """
     Get current authenticated user's profile.
 
@@ -6,12 +6,19 @@ The "Other" category is a system category that cannot be modified.
 "Uncategorized" is not stored - it's just a default value for transactions.
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
 from sqlalchemy.orm import Session
-from typing import List
+from sqlalchemy import update, bindparam, func, case
+from pydantic import TypeAdapter
+from typing import List, Tuple
 
 from app.api.deps import get_db, get_current_user_id
+from app.core import cache
+from app.core.etag import make_etag, etag_matches, not_modified
+from app.db.session import dialect_insert
 from app.models.user_category import UserCategory, DEFAULT_USER_CATEGORIES
+from app.models.transaction import Transaction
+from app.models.merchant_cache import MerchantCache
 from app.schemas.category import (
     CategoryCreate,
     CategoryUpdate,
@@ -22,36 +29,55 @@ from app.schemas.category import (
 
 router = APIRouter()
 
+# Columns needed to build CategoryResponse; read-only listings select just these
+# instead of hydrating full UserCategory instances.
+_CATEGORY_COLUMNS = (
+    UserCategory.id,
+    UserCategory.name,
+    UserCategory.color,
+    UserCategory.icon,
+    UserCategory.sort_order,
+    UserCategory.is_system,
+    UserCategory.created_at,
+)
+
+# Validates a whole category listing in one pydantic-core call
+_categories_adapter = TypeAdapter(List[CategoryResponse])
+
 
 def initialize_default_categories(db: Session, user_id: int) -> List[UserCategory]:
     """
     Initialize default categories for a new user.
     Called automatically when user first accesses their categories.
+
+    Inserts all defaults in one statement; rows that already exist (e.g. from a
+    concurrent first request) are skipped rather than raising.
     """
-    categories = []
-    for cat_data in DEFAULT_USER_CATEGORIES:
-        category = UserCategory(
-            user_id=user_id,
-            name=cat_data["name"],
-            color=cat_data["color"],
-            sort_order=cat_data["sort_order"],
-            is_system=cat_data["is_system"]
-        )
-        db.add(category)
-        categories.append(category)
+    stmt = dialect_insert(UserCategory).values([
+        {"user_id": user_id, **cat_data} for cat_data in DEFAULT_USER_CATEGORIES
+    ]).on_conflict_do_nothing(
+        index_elements=["user_id", "name"]
+    ).returning(*_CATEGORY_COLUMNS)
 
+    categories = db.execute(stmt).all()
     db.commit()
-    for cat in categories:
-        db.refresh(cat)
 
-    return categories
+    if len(categories) < len(DEFAULT_USER_CATEGORIES):
+        # Another request initialized some defaults first; read the full set
+        return db.query(*_CATEGORY_COLUMNS).filter(
+            UserCategory.user_id == user_id
+        ).order_by(UserCategory.sort_order).all()
+
+    return sorted(categories, key=lambda cat: cat.sort_order)
 
 
 def get_user_categories_list(db: Session, user_id: int) -> List[UserCategory]:
     """
     Get user's categories, initializing defaults if none exist.
+
+    Returns read-only rows exposing the CategoryResponse columns.
     """
-    categories = db.query(UserCategory).filter(
+    categories = db.query(*_CATEGORY_COLUMNS).filter(
         UserCategory.user_id == user_id
     ).order_by(UserCategory.sort_order).all()
 
@@ -62,8 +88,24 @@ def get_user_categories_list(db: Session, user_id: int) -> List[UserCategory]:
     return categories
 
 
+def _categories_signature(db: Session, user_id: int) -> tuple:
+    """
+    The user's category count and latest updated_at.
+
+    Creating, editing, reordering or deleting a category changes one of them,
+    so the pair identifies the listing from the database itself, whichever
+    process handled the last write.
+    """
+    return tuple(db.query(
+        func.count(),
+        func.max(UserCategory.updated_at)
+    ).filter(UserCategory.user_id == user_id).one())
+
+
 @router.get("", response_model=CategoryListResponse)
 def get_categories(
+    request: Request,
+    response: Response,
     db: Session = Depends(get_db),
     user_id: int = Depends(get_current_user_id)
 ):
@@ -74,13 +116,29 @@ def get_categories(
     Returns categories sorted by sort_order.
 
     Note: "Uncategorized" is NOT included - it's a system value, not a category.
+
+    Sends an ETag; a matching If-None-Match gets an empty 304.
     """
-    categories = get_user_categories_list(db, user_id)
+    signature = _categories_signature(db, user_id)
+    if signature[0] == 0:
+        # Create the defaults first so the ETag describes the listing sent
+        initialize_default_categories(db, user_id)
+        signature = _categories_signature(db, user_id)
+
+    etag = make_etag(user_id, signature)
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return not_modified(etag)
+
+    def build_response() -> CategoryListResponse:
+        categories = get_user_categories_list(db, user_id)
+        return CategoryListResponse(
+            categories=_categories_adapter.validate_python(categories),
+            total=len(categories)
+        )
 
-    return CategoryListResponse(
-        categories=[CategoryResponse.model_validate(cat) for cat in categories],
-        total=len(categories)
-    )
+    # Keyed by the signature as well, so a cached listing never outlives its rows
+    response.headers["ETag"] = etag
+    return cache.get_or_set("categories", user_id, build_response, variant=signature)
 
 
 @router.post("", response_model=CategoryResponse, status_code=status.HTTP_201_CREATED)
@@ -97,7 +155,7 @@ def create_category(
     # Check if category name already exists (case-insensitive)
     existing = db.query(UserCategory).filter(
         UserCategory.user_id == user_id,
-        UserCategory.name.ilike(category_data.name)
+        func.lower(UserCategory.name) == category_data.name.lower()
     ).first()
 
     if existing:
@@ -123,7 +181,7 @@ def create_category(
 
     db.add(category)
     db.commit()
-    db.refresh(category)
+    cache.invalidate("categories", user_id)
 
     return CategoryResponse.model_validate(category)
 
@@ -165,7 +223,7 @@ def update_category(
     if category_data.name and category_data.name.lower() != category.name.lower():
         existing = db.query(UserCategory).filter(
             UserCategory.user_id == user_id,
-            UserCategory.name.ilike(category_data.name),
+            func.lower(UserCategory.name) == category_data.name.lower(),
             UserCategory.id != category_id
         ).first()
 
@@ -185,23 +243,11 @@ def update_category(
 
     # If name was changed, update all transactions and merchant cache with the old category name
     if category_data.name is not None and category_data.name != old_name:
-        from app.models.transaction import Transaction
-        from app.models.merchant_cache import MerchantCache
-
-        # Update transactions
-        db.query(Transaction).filter(
-            Transaction.user_id == user_id,
-            Transaction.category == old_name
-        ).update({"category": category_data.name})
-
-        # Update merchant cache
-        db.query(MerchantCache).filter(
-            MerchantCache.user_id == user_id,
-            MerchantCache.suggested_category == old_name
-        ).update({"suggested_category": category_data.name})
+        bulk_rename_categories(db, user_id, [(old_name, category_data.name)])
 
     db.commit()
-    db.refresh(category)
+    cache.invalidate("categories", user_id)
+    cache.invalidate("dashboard", user_id)
 
     return CategoryResponse.model_validate(category)
 
@@ -236,7 +282,6 @@ def delete_category(
         )
 
     # Update transactions with this category to "Uncategorized"
-    from app.models.transaction import Transaction
     db.query(Transaction).filter(
         Transaction.user_id == user_id,
         Transaction.category == category.name
@@ -244,6 +289,8 @@ def delete_category(
 
     db.delete(category)
     db.commit()
+    cache.invalidate("categories", user_id)
+    cache.invalidate("dashboard", user_id)
 
     return None
 
@@ -260,12 +307,12 @@ def reorder_categories(
     System categories (like "Other") will always remain at the end.
     """
     # Validate all category IDs belong to user
-    categories = db.query(UserCategory).filter(
+    owned_count = db.query(func.count(UserCategory.id)).filter(
         UserCategory.id.in_(reorder_data.category_ids),
         UserCategory.user_id == user_id
-    ).all()
+    ).scalar()
 
-    if len(categories) != len(reorder_data.category_ids):
+    if owned_count != len(reorder_data.category_ids):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Invalid category IDs"
@@ -274,18 +321,24 @@ def reorder_categories(
     # Create lookup for new order
     id_to_order = {cat_id: idx for idx, cat_id in enumerate(reorder_data.category_ids)}
 
-    # Update sort_order for each category
-    for category in categories:
-        if not category.is_system:  # Don't reorder system categories
-            category.sort_order = id_to_order[category.id]
+    # Update sort_order in one statement; system categories are never reordered
+    db.query(UserCategory).filter(
+        UserCategory.id.in_(reorder_data.category_ids),
+        UserCategory.user_id == user_id,
+        UserCategory.is_system == False
+    ).update(
+        {UserCategory.sort_order: case(id_to_order, value=UserCategory.id)},
+        synchronize_session=False
+    )
 
     db.commit()
+    cache.invalidate("categories", user_id)
 
     # Return updated list
     all_categories = get_user_categories_list(db, user_id)
 
     return CategoryListResponse(
-        categories=[CategoryResponse.model_validate(cat) for cat in all_categories],
+        categories=_categories_adapter.validate_python(all_categories),
         total=len(all_categories)
     )
 
@@ -302,7 +355,6 @@ def reset_categories(
     Transactions will have their categories set to "Uncategorized".
     """
     # Update all transactions to Uncategorized
-    from app.models.transaction import Transaction
     db.query(Transaction).filter(
         Transaction.user_id == user_id
     ).update({"category": "Uncategorized", "category_source": "uncategorized"})
@@ -316,14 +368,54 @@ def reset_categories(
 
     # Create defaults
     categories = initialize_default_categories(db, user_id)
+    cache.invalidate("categories", user_id)
+    cache.invalidate("dashboard", user_id)
 
     return CategoryListResponse(
-        categories=[CategoryResponse.model_validate(cat) for cat in categories],
+        categories=_categories_adapter.validate_python(categories),
         total=len(categories)
     )
 
 
-# Helper function for other services
+# Helper functions for other services
+def bulk_rename_categories(
+    db: Session,
+    user_id: int,
+    renames: List[Tuple[str, str]]
+) -> None:
+    """
+    Rename categories on transactions and merchant cache entries.
+
+    Each table gets a single executemany UPDATE over all (old_name, new_name)
+    pairs instead of one round-trip per rename. Pairs are applied in order.
+    The caller is responsible for committing.
+    """
+    if not renames:
+        return
+
+    params = [{"old_name": old, "new_name": new} for old, new in renames]
+
+    db.execute(
+        update(Transaction.__table__)
+        .where(
+            Transaction.__table__.c.user_id == user_id,
+            Transaction.__table__.c.category == bindparam("old_name")
+        )
+        .values(category=bindparam("new_name")),
+        params
+    )
+
+    db.execute(
+        update(MerchantCache.__table__)
+        .where(
+            MerchantCache.__table__.c.user_id == user_id,
+            MerchantCache.__table__.c.suggested_category == bindparam("old_name")
+        )
+        .values(suggested_category=bindparam("new_name")),
+        params
+    )
+
+
 def get_user_category_names(db: Session, user_id: int) -> List[str]:
     """
     Get list of category names for a user.
@@ -1,10 +1,12 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query
 from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy import func, case, select
 from datetime import date
+from typing import Optional
 from dateutil.relativedelta import relativedelta
 
 from app.api.deps import get_db, get_current_user_id
+from app.core import cache
 from app.models.transaction import Transaction
 from app.models.account import Account
 from app.schemas.transaction import DashboardStats, DateRangeEnum
@@ -13,6 +15,83 @@ from app.api.v1.transactions import _get_date_range
 router = APIRouter()
 
 
+def _aggregate_stats(db: Session, user_id: int, start_date: date, end_date: Optional[date] = None) -> DashboardStats:
+    """
+    Compute dashboard statistics for a user's transactions in a date range.
+
+    Totals and the top spending category are aggregated in SQL, so no
+    transaction rows are loaded into Python.
+    """
+    filters = [Transaction.user_id == user_id, Transaction.date >= start_date]
+    if end_date is not None:
+        filters.append(Transaction.date <= end_date)
+
+    # Account count rides along as a scalar subquery to save a round-trip
+    account_count = select(func.count(Account.id)).where(
+        Account.user_id == user_id
+    ).scalar_subquery()
+
+    # Totals and count in one pass over the range
+    totals = db.query(
+        func.coalesce(func.sum(case((Transaction.amount < 0, Transaction.amount), else_=0)), 0).label("expenses"),
+        func.coalesce(func.sum(case((Transaction.amount > 0, Transaction.amount), else_=0)), 0).label("income"),
+        func.count(Transaction.id).label("cnt"),
+        account_count.label("account_count")
+    ).filter(*filters).one()
+
+    total_expenses = float(totals.expenses)
+    total_income = float(totals.income)
+    total_balance = total_income + total_expenses  # expenses are negative
+    savings = total_balance
+
+    # Calculate savings rate
+    savings_rate = (savings / total_income * 100) if total_income > 0 else 0.0
+
+    # Get top spending category (most negative expense total)
+    spent = func.sum(Transaction.amount).label("spent")
+    top = db.query(Transaction.category, spent).filter(
+        *filters,
+        Transaction.amount < 0
+    ).group_by(Transaction.category).order_by(spent).first()
+
+    top_category = top.category if top else None
+    top_category_amount = abs(top.spent) if top else 0.0
+
+    # Every field is computed here with the right type, so skip re-validation
+    return DashboardStats.model_construct(
+        total_balance=total_balance,
+        total_expenses=abs(total_expenses),
+        total_income=total_income,
+        savings=savings,
+        savings_rate=round(savings_rate, 2),
+        transaction_count=totals.cnt,
+        account_count=totals.account_count,
+        top_category=top_category,
+        top_category_amount=top_category_amount
+    )
+
+
+def _stats_signature(db: Session, user_id: int) -> tuple:
+    """
+    Cheap fingerprint of the data behind the dashboard stats.
+
+    Any transaction insert, update or delete changes the user's transaction
+    count or latest updated_at (an index-only scan of
+    ix_transactions_user_updated), and the account count covers account
+    creation. Part of the cache key, so a cached entry can't outlive the rows
+    it was built from, even when the write was handled by another process.
+    """
+    account_count = select(func.count(Account.id)).where(
+        Account.user_id == user_id
+    ).scalar_subquery()
+
+    return tuple(db.query(
+        func.count(),
+        func.max(Transaction.updated_at),
+        account_count
+    ).filter(Transaction.user_id == user_id).one())
+
+
 @router.get("/stats", response_model=DashboardStats)
 def get_dashboard_stats(
     date_range: DateRangeEnum = DateRangeEnum.last_30_days,
@@ -39,60 +118,17 @@ def get_dashboard_stats(
     # Get date range
     start_date, end_date = _get_date_range(date_range)
 
-    # Get all transactions for the selected period
-    transactions = db.query(Transaction).filter(
-        Transaction.user_id == user_id,
-        Transaction.date >= start_date,
-        Transaction.date <= end_date
-    ).all()
-
-    # Calculate totals
-    total_expenses = sum(t.amount for t in transactions if t.amount < 0)
-    total_income = sum(t.amount for t in transactions if t.amount > 0)
-    total_balance = total_income + total_expenses  # expenses are negative
-    savings = total_balance
-
-    # Calculate savings rate
-    savings_rate = (savings / total_income * 100) if total_income > 0 else 0.0
-
-    # Get transaction count
-    transaction_count = len(transactions)
-
-    # Get account count
-    account_count = db.query(func.count(Account.id)).filter(
-        Account.user_id == user_id
-    ).scalar() or 0
-
-    # Get top spending category
-    category_totals = {}
-    for t in transactions:
-        if t.amount < 0:  # Only count expenses
-            category_totals[t.category] = category_totals.get(t.category, 0) + t.amount
-
-    top_category = None
-    top_category_amount = 0.0
-
-    if category_totals:
-        # Get category with most spending (most negative)
-        top_category = min(category_totals.items(), key=lambda x: x[1])[0]
-        top_category_amount = abs(category_totals[top_category])
-
-    return DashboardStats(
-        total_balance=total_balance,
-        total_expenses=abs(total_expenses),
-        total_income=total_income,
-        savings=savings,
-        savings_rate=round(savings_rate, 2),
-        transaction_count=transaction_count,
-        account_count=account_count,
-        top_category=top_category,
-        top_category_amount=top_category_amount
+    # Served from a short-lived per-user cache; transaction writes invalidate it
+    return cache.get_or_set(
+        "dashboard", user_id,
+        lambda: _aggregate_stats(db, user_id, start_date, end_date),
+        variant=(start_date, end_date, _stats_signature(db, user_id))
     )
 
 
 @router.get("/stats/period", response_model=DashboardStats)
 def get_dashboard_stats_period(
-    months: int = 1,
+    months: int = Query(1, ge=1, le=60, description="Months to look back"),
     db: Session = Depends(get_db),
     user_id: int = Depends(get_current_user_id)
 ):
@@ -100,7 +136,7 @@ def get_dashboard_stats_period(
     Get dashboard statistics for a specific period.
 
     Parameters:
-    - months: Number of months to look back (default: 1)
+    - months: Number of months to look back (1-60, default: 1)
 
     Returns the same stats as /stats but for the specified period.
     """
@@ -108,50 +144,8 @@ def get_dashboard_stats_period(
     today = date.today()
     start_date = today - relativedelta(months=months)
 
-    # Get all transactions for the period
-    transactions = db.query(Transaction).filter(
-        Transaction.user_id == user_id,
-        Transaction.date >= start_date
-    ).all()
-
-    # Calculate totals
-    total_expenses = sum(t.amount for t in transactions if t.amount < 0)
-    total_income = sum(t.amount for t in transactions if t.amount > 0)
-    total_balance = total_income + total_expenses
-    savings = total_balance
-
-    # Calculate savings rate
-    savings_rate = (savings / total_income * 100) if total_income > 0 else 0.0
-
-    # Get transaction count
-    transaction_count = len(transactions)
-
-    # Get account count
-    account_count = db.query(func.count(Account.id)).filter(
-        Account.user_id == user_id
-    ).scalar() or 0
-
-    # Get top spending category
-    category_totals = {}
-    for t in transactions:
-        if t.amount < 0:
-            category_totals[t.category] = category_totals.get(t.category, 0) + t.amount
-
-    top_category = None
-    top_category_amount = 0.0
-
-    if category_totals:
-        top_category = min(category_totals.items(), key=lambda x: x[1])[0]
-        top_category_amount = abs(category_totals[top_category])
-
-    return DashboardStats(
-        total_balance=total_balance,
-        total_expenses=abs(total_expenses),
-        total_income=total_income,
-        savings=savings,
-        savings_rate=round(savings_rate, 2),
-        transaction_count=transaction_count,
-        account_count=account_count,
-        top_category=top_category,
-        top_category_amount=top_category_amount
+    return cache.get_or_set(
+        "dashboard", user_id,
+        lambda: _aggregate_stats(db, user_id, start_date),
+        variant=(start_date, None, _stats_signature(db, user_id))
     )
@@ -8,16 +8,18 @@ Provides endpoints for:
 - Triggering background analysis
 """
 
-import asyncio
 import logging
-from concurrent.futures import ThreadPoolExecutor
 from fastapi import APIRouter, Depends, HTTPException, Query, BackgroundTasks
+from pydantic import TypeAdapter
 from sqlalchemy.orm import Session
+from sqlalchemy import func
 from typing import List
-from datetime import datetime
+from datetime import date, datetime, timedelta
 
 from app.api.deps import get_db, get_current_user_id
+from app.core import cache
 from app.db.session import SessionLocal
+from app.models.transaction import Transaction
 from app.schemas.recurring import (
     RecurringPayment,
     RecurringPaymentsResponse,
@@ -29,8 +31,7 @@ from app.schemas.recurring import (
 from app.services.recurring_detection import (
     detect_recurring_payments,
     get_cached_recurring_payments,
-    get_upcoming_payments,
-    calculate_monthly_amount
+    get_upcoming_payments
 )
 from app.services.recurring_insights import (
     generate_recurring_insights,
@@ -41,34 +42,28 @@ from app.services.recurring_insights import (
 logger = logging.getLogger("categorization")
 router = APIRouter()
 
-# Thread pool for background tasks
-executor = ThreadPoolExecutor(max_workers=2)
+# Validates a whole list of payment dicts in one pydantic-core call
+_payments_adapter = TypeAdapter(List[RecurringPayment])
 
-
-def _run_detection_in_background(user_id: int):
+async def _run_detection_in_background(user_id: int):
     """
-    Run recurring detection in a background thread.
-    Creates its own database session and event loop.
+    Run recurring detection after the response has been sent.
+
+    Scheduled with BackgroundTasks on the app's event loop; its database
+    phases and the AI calls run in worker threads inside
+    detect_recurring_payments. Opens its own database session since the
+    request session is closed by then.
     """
     db = SessionLocal()
     try:
         logger.info(f"Background recurring detection started for user {user_id}")
 
-        # Create new event loop for this thread
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-
-        try:
-            result = loop.run_until_complete(
-                detect_recurring_payments(
-                    user_id=user_id,
-                    db=db,
-                    force_refresh=True
-                )
-            )
-            logger.info(f"Background detection complete: {len(result)} recurring payments found")
-        finally:
-            loop.close()
+        result = await detect_recurring_payments(
+            user_id=user_id,
+            db=db,
+            force_refresh=True
+        )
+        logger.info(f"Background detection complete: {len(result)} recurring payments found")
 
     except Exception as e:
         logger.error(f"Background detection failed: {e}", exc_info=True)
@@ -112,34 +107,12 @@ async def get_recurring_payments(
                     force_refresh=False
                 )
 
-        # Calculate totals
-        total_monthly = sum(
-            calculate_monthly_amount(p["typical_amount"], p["frequency"])
-            for p in recurring_payments
-        )
+        # Calculate totals from the monthly amounts stored at detection time
+        total_monthly = sum(p["monthly_amount"] for p in recurring_payments)
         total_yearly = total_monthly * 12
 
         return RecurringPaymentsResponse(
-            recurring_payments=[
-                RecurringPayment(
-                    merchant_key=p["merchant_key"],
-                    merchant_name=p["merchant_name"],
-                    category=p["category"],
-                    frequency=p["frequency"],
-                    typical_amount=p["typical_amount"],
-                    amount_variance=p["amount_variance"],
-                    confidence=p["confidence"],
-                    transaction_count=p["transaction_count"],
-                    last_transaction_date=datetime.strptime(
-                        p["last_transaction_date"], "%Y-%m-%d"
-                    ).date() if p["last_transaction_date"] else None,
-                    next_expected_date=datetime.strptime(
-                        p["next_expected_date"], "%Y-%m-%d"
-                    ).date() if p["next_expected_date"] else None,
-                    ai_notes=p.get("ai_notes")
-                )
-                for p in recurring_payments
-            ],
+            recurring_payments=_payments_adapter.validate_python(recurring_payments),
             total_count=len(recurring_payments),
             total_monthly=round(total_monthly, 2),
             total_yearly=round(total_yearly, 2)
@@ -172,25 +145,25 @@ async def analyze_recurring_payments(
     """
     try:
         # Count merchants to analyze
-        from app.models.transaction import Transaction
-        from sqlalchemy import func
-        from datetime import timedelta
-
         cutoff_date = datetime.utcnow().date() - timedelta(days=180)
 
-        # Count merchants with 2+ expense transactions (only expenses, not income)
-        merchant_counts = db.query(
-            Transaction.merchant_key,
-            func.count(Transaction.id).label("count")
-        ).filter(
-            Transaction.user_id == user_id,
-            Transaction.date >= cutoff_date,
-            Transaction.amount < 0  # Only expenses (negative amounts)
-        ).group_by(Transaction.merchant_key).having(
-            func.count(Transaction.id) >= 2
-        ).all()
-
-        merchants_to_analyze = len(merchant_counts)
+        # Count merchants with 2+ expense transactions (only expenses, not income).
+        # Only used for the status message, so repeat clicks reuse a cached count;
+        # transaction writes invalidate it.
+        def count_merchants() -> int:
+            return db.query(func.count()).select_from(
+                db.query(Transaction.merchant_key).filter(
+                    Transaction.user_id == user_id,
+                    Transaction.date >= cutoff_date,
+                    Transaction.amount < 0  # Only expenses (negative amounts)
+                ).group_by(Transaction.merchant_key).having(
+                    func.count(Transaction.id) >= 2
+                ).subquery()
+            ).scalar()
+
+        merchants_to_analyze = cache.get_or_set(
+            "analyze_merchants", user_id, count_merchants, variant=cutoff_date
+        )
 
         if merchants_to_analyze == 0:
             return AnalyzeResponse(
@@ -199,8 +172,8 @@ async def analyze_recurring_payments(
                 merchants_to_analyze=0
             )
 
-        # Run detection in background thread
-        executor.submit(_run_detection_in_background, user_id)
+        # Run detection once the response has been sent
+        background_tasks.add_task(_run_detection_in_background, user_id)
 
         return AnalyzeResponse(
             message=f"Analysis started for {merchants_to_analyze} merchants",
@@ -248,8 +221,8 @@ async def get_insights(
                 # Save to DB
                 save_insights(user_id, db, result)
         else:
-            # Force refresh - generate new insights
-            result = await generate_recurring_insights(user_id=user_id, db=db)
+            # Force refresh - generate new insights, bypassing the LLM cache
+            result = await generate_recurring_insights(user_id=user_id, db=db, use_cache=False)
             # Save to DB
             save_insights(user_id, db, result)
 
@@ -269,9 +242,7 @@ async def get_insights(
                     merchant_key=u.get("merchant_key", u.get("merchant", "")),
                     merchant_name=u.get("merchant_name", u.get("merchant", "")),
                     amount=u["amount"],
-                    expected_date=datetime.strptime(
-                        u["date"], "%Y-%m-%d"
-                    ).date() if isinstance(u["date"], str) else u["date"],
+                    expected_date=date.fromisoformat(u["date"]) if isinstance(u["date"], str) else u["date"],
                     days_until=u["days_until"]
                 )
                 for u in result.get("upcoming", [])
@@ -311,14 +282,13 @@ async def get_upcoming(
             days=days
         )
 
+        # Values come straight from typed DB columns; skip per-item validation
         return [
-            UpcomingPayment(
+            UpcomingPayment.model_construct(
                 merchant_key=u["merchant_key"],
                 merchant_name=u["merchant_name"],
                 amount=u["amount"],
-                expected_date=datetime.strptime(
-                    u["expected_date"], "%Y-%m-%d"
-                ).date() if isinstance(u["expected_date"], str) else u["expected_date"],
+                expected_date=u["expected_date"],
                 days_until=u["days_until"]
             )
             for u in upcoming
@@ -1,15 +1,23 @@
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form, Query, BackgroundTasks
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form, Query, BackgroundTasks, Request, Response
 from sqlalchemy.orm import Session
-from sqlalchemy import func, or_
+from sqlalchemy import func, case, insert, or_, tuple_
+from pydantic import TypeAdapter
 from typing import Optional, List
 from datetime import date, datetime, timedelta
 from collections import defaultdict
+from functools import lru_cache
+from itertools import groupby
+from operator import attrgetter
 from dateutil.relativedelta import relativedelta
+from openai import APIStatusError
 import asyncio
-import time
 import logging
+import random
+import re
 
 from app.api.deps import get_db, get_current_user_id
+from app.core import cache
+from app.core.etag import make_etag, etag_matches, not_modified
 from app.models.transaction import Transaction
 from app.models.account import Account
 from app.db.session import SessionLocal
@@ -35,20 +43,154 @@ from app.services.auto_categorization import categorize_transactions_batch
 from app.core.logging_config import get_categorization_logger
 
 router = APIRouter()
+
+# Bytes read from the head of an uploaded CSV for format detection
+CSV_SAMPLE_BYTES = 64 * 1024
+
+# Maximum IDs per DELETE statement in batch deletes
+DELETE_CHUNK_SIZE = 500
+
+# Columns backing TransactionResponse; read pages as plain rows, not ORM objects
+_TRANSACTION_RESPONSE_COLUMNS = tuple(
+    getattr(Transaction, name) for name in TransactionResponse.model_fields
+)
+
+# Validates a whole page of rows in one pydantic-core call
+_transactions_adapter = TypeAdapter(List[TransactionResponse])
+
+# AI categorization batches in flight at once during background categorization
+CATEGORIZATION_CONCURRENCY = 4
+
+# Upper bound (seconds) on the back-off between categorization retries
+CATEGORIZATION_MAX_RETRY_DELAY = 30
+
+# Characters dropped from manual-entry merchant keys: anything that isn't
+# alphanumeric or whitespace (\w also matches "_", which isn't alphanumeric)
+_MERCHANT_KEY_STRIP = re.compile(r"[^\w\s]|_")
+
 logger = get_categorization_logger()
+LOG_SEPARATOR = "=" * 80
+
+
+def _retry_delay(retry_count: int) -> float:
+    """Exponential back-off with jitter so concurrent batches don't retry in lockstep."""
+    return min(CATEGORIZATION_MAX_RETRY_DELAY, 2 ** retry_count + random.random())
+
+
+def _is_retryable(error: Exception) -> bool:
+    """Client errors from the AI API (other than timeouts, conflicts and rate limits) won't succeed on retry."""
+    if isinstance(error, APIStatusError):
+        return error.status_code in (408, 409, 429) or error.status_code >= 500
+    return True
+
+
+def _categorize_batch(transaction_ids: List[int], user_id: int) -> dict:
+    """Categorize and apply one batch in a fresh session (blocking; run in a worker thread)."""
+    db = SessionLocal()
+    try:
+        return categorize_transactions_batch(
+            transaction_ids=transaction_ids,
+            db=db,
+            user_id=user_id,
+            auto_apply=True
+        )
+    except Exception:
+        # Discard anything left pending by the failed attempt
+        db.rollback()
+        raise
+    finally:
+        db.close()
 
 
-def _categorize_transactions_in_background(
+async def _categorize_batch_with_retry(
+    batch: List[int],
+    batch_num: int,
+    total_batches: int,
+    user_id: int,
+    max_retries: int,
+    semaphore: asyncio.Semaphore
+):
+    """
+    Categorize one batch, retrying failed transactions up to max_retries times.
+
+    Each attempt runs in a worker thread with its own database session, so
+    concurrent batches never share a session or block the event loop.
+    """
+    async with semaphore:
+        logger.info("📦 Processing batch %d/%d (%d transactions)...", batch_num, total_batches, len(batch))
+
+        # Track which transactions need to be retried
+        current_batch = batch
+        retry_count = 0
+
+        while retry_count <= max_retries:
+            try:
+                # Categorize this batch
+                result = await asyncio.to_thread(_categorize_batch, current_batch, user_id)
+
+                successful = result['successful']
+                total = result['total_processed']
+                failed = result['failed']
+
+                if retry_count == 0:
+                    logger.info("   ✅ Batch %d complete: %d/%d successful", batch_num, successful, total)
+                else:
+                    logger.info("   🔄 Batch %d retry %d complete: %d/%d successful", batch_num, retry_count, successful, total)
+
+                # Check if we need to retry
+                if failed == 0 or successful == total:
+                    # All successful
+                    break
+                elif retry_count < max_retries:
+                    # Get failed transaction IDs for retry
+                    failed_txn_ids = [
+                        r['transaction_id']
+                        for r in result['results']
+                        if r.get('error') is not None
+                    ]
+
+                    if failed_txn_ids:
+                        retry_count += 1
+                        current_batch = failed_txn_ids
+                        logger.warning(
+                            "   ⚠️  Batch %d: %d failed, retrying %d transactions (attempt %d/%d)...",
+                            batch_num, failed, len(failed_txn_ids), retry_count, max_retries
+                        )
+                        await asyncio.sleep(_retry_delay(retry_count))
+                    else:
+                        break
+                else:
+                    # Max retries reached
+                    logger.error("   ❌ Batch %d: max retries reached. %d transactions still failed.", batch_num, failed)
+                    break
+
+            except Exception as e:
+                if not _is_retryable(e):
+                    logger.error("   ❌ Batch %d failed with a permanent error: %s", batch_num, e)
+                    break
+                elif retry_count < max_retries:
+                    retry_count += 1
+                    logger.error("   ❌ Batch %d error: %s", batch_num, e)
+                    logger.info("   🔄 Retrying batch %d (attempt %d/%d)...", batch_num, retry_count, max_retries)
+                    await asyncio.sleep(_retry_delay(retry_count))
+                else:
+                    logger.error("   ❌ Batch %d failed after %d retries: %s", batch_num, max_retries, e)
+                    break
+
+
+async def _categorize_transactions_in_background(
     transaction_ids: List[int],
     user_id: int,
     batch_size: int = 10,
-    max_retries: int = 2
+    max_retries: int = 2,
+    concurrency: int = CATEGORIZATION_CONCURRENCY
 ):
     """
     Background task to categorize transactions in batches with automatic retry.
 
-    This runs in a thread pool to avoid blocking the FastAPI event loop,
-    allowing the server to continue handling other requests.
+    Scheduled with BackgroundTasks on the app's event loop, which only
+    coordinates: each batch's database work and AI call run in a worker thread
+    (see _categorize_batch). Up to `concurrency` batches are in flight at once.
 
     If a batch has failures, failed transactions will be automatically retried
     up to max_retries times.
@@ -58,104 +200,42 @@ def _categorize_transactions_in_background(
         user_id: User ID
         batch_size: Number of transactions to process per batch (default: 10)
         max_retries: Maximum number of retry attempts for failed transactions (default: 2)
+        concurrency: Maximum number of batches categorized concurrently
     """
-    logger.info("=" * 80)
-    logger.info(f"🤖 Starting background categorization for {len(transaction_ids)} transactions")
-    logger.info(f"   Batch size: {batch_size}")
-    logger.info(f"   Total batches: {(len(transaction_ids) + batch_size - 1) // batch_size}")
-    logger.info(f"   Max retries: {max_retries}")
-    logger.info("=" * 80)
-
-    # Create a new database session for background task
-    db = SessionLocal()
+    batches = [
+        transaction_ids[i:i + batch_size]
+        for i in range(0, len(transaction_ids), batch_size)
+    ]
 
-    # Create a new event loop for this thread
-    loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(loop)
+    # The banner is decorative; skip building it when INFO is filtered out
+    if logger.isEnabledFor(logging.INFO):
+        logger.info(LOG_SEPARATOR)
+        logger.info("🤖 Starting background categorization for %d transactions", len(transaction_ids))
+        logger.info("   Batch size: %d", batch_size)
+        logger.info("   Total batches: %d", len(batches))
+        logger.info("   Concurrency: %d", concurrency)
+        logger.info("   Max retries: %d", max_retries)
+        logger.info(LOG_SEPARATOR)
 
-    try:
-        # Process in batches
-        for i in range(0, len(transaction_ids), batch_size):
-            batch = transaction_ids[i:i + batch_size]
-            batch_num = (i // batch_size) + 1
-            total_batches = (len(transaction_ids) + batch_size - 1) // batch_size
-
-            logger.info(f"📦 Processing batch {batch_num}/{total_batches} ({len(batch)} transactions)...")
-
-            # Track which transactions need to be retried
-            current_batch = batch
-            retry_count = 0
-
-            while retry_count <= max_retries:
-                try:
-                    # Categorize this batch (run async function in this thread's event loop)
-                    result = loop.run_until_complete(
-                        categorize_transactions_batch(
-                            transaction_ids=current_batch,
-                            db=db,
-                            user_id=user_id,
-                            auto_apply=True
-                        )
-                    )
+    semaphore = asyncio.Semaphore(concurrency)
 
-                    successful = result['successful']
-                    total = result['total_processed']
-                    failed = result['failed']
-
-                    if retry_count == 0:
-                        logger.info(f"   ✅ Batch {batch_num} complete: {successful}/{total} successful")
-                    else:
-                        logger.info(f"   🔄 Retry {retry_count} complete: {successful}/{total} successful")
-
-                    # Check if we need to retry
-                    if failed == 0 or successful == total:
-                        # All successful, move to next batch
-                        break
-                    elif retry_count < max_retries:
-                        # Get failed transaction IDs for retry
-                        failed_txn_ids = [
-                            r['transaction_id']
-                            for r in result['results']
-                            if r.get('error') is not None
-                        ]
-
-                        if failed_txn_ids:
-                            retry_count += 1
-                            current_batch = failed_txn_ids
-                            logger.warning(f"   ⚠️  {failed} failed, retrying {len(failed_txn_ids)} transactions (attempt {retry_count}/{max_retries})...")
-                            time.sleep(2)  # Longer delay before retry
-                        else:
-                            break
-                    else:
-                        # Max retries reached
-                        logger.error(f"   ❌ Max retries reached. {failed} transactions still failed.")
-                        break
-
-                except Exception as e:
-                    if retry_count < max_retries:
-                        retry_count += 1
-                        logger.error(f"   ❌ Batch {batch_num} error: {e}")
-                        logger.info(f"   🔄 Retrying batch (attempt {retry_count}/{max_retries})...")
-                        time.sleep(2)
-                    else:
-                        logger.error(f"   ❌ Batch {batch_num} failed after {max_retries} retries: {e}")
-                        break
-
-            # Delay between batches to avoid rate limiting
-            if i + batch_size < len(transaction_ids):
-                time.sleep(1)
+    try:
+        await asyncio.gather(*[
+            _categorize_batch_with_retry(
+                batch, batch_num, len(batches), user_id, max_retries, semaphore
+            )
+            for batch_num, batch in enumerate(batches, start=1)
+        ])
 
-        logger.info("=" * 80)
-        logger.info("✅ Background categorization complete!")
-        logger.info("=" * 80)
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(LOG_SEPARATOR)
+            logger.info("✅ Background categorization complete!")
+            logger.info(LOG_SEPARATOR)
 
     except Exception as e:
-        logger.error("=" * 80)
-        logger.error(f"❌ Background categorization error: {e}", exc_info=True)
-        logger.error("=" * 80)
-    finally:
-        db.close()
-        loop.close()
+        logger.error(LOG_SEPARATOR)
+        logger.error("❌ Background categorization error: %s", e, exc_info=True)
+        logger.error(LOG_SEPARATOR)
 
 
 @router.post("/upload_csv", response_model=CSVUploadResponse)
@@ -188,54 +268,54 @@ async def upload_csv(
     if not file.filename.endswith('.csv'):
         raise HTTPException(status_code=400, detail="File must be a CSV")
 
-    # Read file content
-    content = await file.read()
+    # Only a head sample is needed for format detection; the parsers then stream
+    # the spooled upload in chunks instead of holding the whole file in memory.
+    # Trim to the last full line so a multi-byte character is never split.
+    sample = await file.read(CSV_SAMPLE_BYTES)
+    sample = sample[:sample.rfind(b"\n") + 1] or sample
 
     # Parse CSV using AI format detection
     try:
         # Step 1: Detect CSV format using AI
         logger.info(f"📄 Detecting CSV format for file: {file.filename}")
-        format_config = await detect_csv_format(content)
+        format_config = await detect_csv_format(sample)
         logger.info(f"📊 Detected format: date_column={format_config.get('date_column')}, "
                    f"amount_column={format_config.get('amount_column')}, "
                    f"amount_is_absolute={format_config.get('amount_is_absolute')}")
 
         # Step 2: Try universal parser with detected format
         try:
-            inserted, skipped, final_account_id = parse_csv_universal(
-                content, format_config, db, user_id, account_id
+            await file.seek(0)
+            inserted, skipped, final_account_id, transaction_ids = parse_csv_universal(
+                file.file, format_config, db, user_id, account_id
             )
             logger.info(f"✅ Universal parser succeeded: {inserted} inserted, {skipped} skipped")
         except Exception as parse_error:
             # Step 3: Fallback to RBC parser if universal parser fails
             logger.warning(f"⚠️ Universal parser failed: {parse_error}. Trying RBC parser...")
-            inserted, skipped, final_account_id = parse_rbc_csv(
-                content, db, user_id, account_id
+            # Discard any rows the failed parser already flushed
+            db.rollback()
+            await file.seek(0)
+            inserted, skipped, final_account_id, transaction_ids = parse_rbc_csv(
+                file.file, db, user_id, account_id
             )
             logger.info(f"✅ RBC parser fallback succeeded: {inserted} inserted, {skipped} skipped")
 
+        cache.invalidate("dashboard", user_id)
+        cache.invalidate("analyze_merchants", user_id)
+
         # Auto-categorize if requested (in background)
-        if auto_categorize and inserted > 0:
-            # Get the IDs of newly inserted transactions
-            new_transactions = db.query(Transaction).filter(
-                Transaction.account_id == final_account_id,
-                Transaction.user_id == user_id,
-                Transaction.category == "Uncategorized"
-            ).order_by(Transaction.created_at.desc()).limit(inserted).all()
-
-            if new_transactions:
-                transaction_ids = [t.id for t in new_transactions]
-
-                # Add background task for categorization
-                background_tasks.add_task(
-                    _categorize_transactions_in_background,
-                    transaction_ids,
-                    user_id,
-                    batch_size=10  # Process 10 at a time
-                )
-
-                logger.info(f"📤 CSV uploaded: {inserted} transactions")
-                logger.info(f"🤖 Queued {len(transaction_ids)} transactions for background categorization")
+        if auto_categorize and transaction_ids:
+            # Add background task for categorization of the newly inserted transactions
+            background_tasks.add_task(
+                _categorize_transactions_in_background,
+                transaction_ids,
+                user_id,
+                batch_size=10  # Process 10 at a time
+            )
+
+            logger.info(f"📤 CSV uploaded: {inserted} transactions")
+            logger.info(f"🤖 Queued {len(transaction_ids)} transactions for background categorization")
 
         return CSVUploadResponse(
             inserted_count=inserted,
@@ -280,36 +360,42 @@ def create_transaction(
             )
             db.add(account)
             db.commit()
-            db.refresh(account)
+            cache.invalidate("accounts", user_id)
+            cache.invalidate("dashboard", user_id)
+            cache.invalidate("analyze_merchants", user_id)
         account_id = account.id
 
     # Generate merchant_key from description (lowercase, no special chars)
-    merchant_key = ''.join(c.lower() for c in transaction.description if c.isalnum() or c.isspace()).strip()
+    merchant_key = _MERCHANT_KEY_STRIP.sub('', transaction.description).lower()
     merchant_key = '_'.join(merchant_key.split())[:50]  # Max 50 chars
 
-    # Create the transaction
-    new_transaction = Transaction(
-        user_id=user_id,
-        account_id=account_id,
-        date=transaction.date,
-        description_raw=transaction.description,
-        merchant_key=merchant_key,
-        amount=transaction.amount,
-        currency="CAD",
-        category=transaction.category,
-        category_source="user",  # Mark as user-created
-        note_user=transaction.note
-    )
-
-    db.add(new_transaction)
+    # Create the transaction; RETURNING hands back the response columns
+    # directly, skipping the unit of work and a follow-up refresh SELECT
+    new_transaction = db.execute(
+        insert(Transaction).values(
+            user_id=user_id,
+            account_id=account_id,
+            date=transaction.date,
+            description_raw=transaction.description,
+            merchant_key=merchant_key,
+            amount=transaction.amount,
+            currency="CAD",
+            category=transaction.category,
+            category_source="user",  # Mark as user-created
+            note_user=transaction.note
+        ).returning(*_TRANSACTION_RESPONSE_COLUMNS)
+    ).one()
     db.commit()
-    db.refresh(new_transaction)
+    cache.invalidate("dashboard", user_id)
+    cache.invalidate("analyze_merchants", user_id)
 
     return new_transaction
 
 
 @router.get("/view", response_model=TransactionViewResponse)
 def get_transactions_view(
+    request: Request,
+    response: Response,
     account_id: Optional[int] = None,
     start_date: Optional[date] = None,
     end_date: Optional[date] = None,
@@ -320,6 +406,8 @@ def get_transactions_view(
     max_amount: Optional[float] = None,
     page: int = 1,
     page_size: int = 50,
+    cursor_date: Optional[date] = None,
+    cursor_id: Optional[int] = None,
     db: Session = Depends(get_db),
     user_id: int = Depends(get_current_user_id)
 ):
@@ -333,7 +421,38 @@ def get_transactions_view(
     - Use date_range for preset ranges: "this_month", "last_month", "last_3_months", etc.
     - Or use start_date and end_date for custom ranges
     - date_range takes precedence over start_date/end_date
+
+    Pagination:
+    - Rows are ordered by date then id, newest first
+    - Pass the previous response's pagination.next_cursor as cursor_date/cursor_id
+      to fetch the following page without an OFFSET scan; page is then ignored
+    - cursor_date and cursor_id must be sent together
+    - next_cursor is null on the last page
+
+    Sends an ETag; a matching If-None-Match gets an empty 304 without
+    recomputing the page or aggregates.
     """
+    if (cursor_date is None) != (cursor_id is None):
+        raise HTTPException(
+            status_code=422,
+            detail="cursor_date and cursor_id must be provided together"
+        )
+
+    # Any insert, update or delete changes the user's row count or latest
+    # updated_at. The user, the query string and today's date (relative date
+    # ranges move daily) complete the signature. It is taken over all of the
+    # user's rows rather than the filtered set, since an edit can move a row
+    # out of the filter without changing the filtered count or max(updated_at);
+    # ix_transactions_user_updated covers the query, so it is an index-only scan.
+    signature = db.query(
+        func.count(),
+        func.max(Transaction.updated_at)
+    ).filter(Transaction.user_id == user_id).one()
+    etag = make_etag(user_id, tuple(signature), request.url.query, date.today())
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return not_modified(etag)
+    response.headers["ETag"] = etag
+
     # Apply date_range if provided
     if date_range:
         start_date, end_date = _get_date_range(date_range)
@@ -370,26 +489,33 @@ def get_transactions_view(
     if max_amount is not None:
         query = query.filter(Transaction.amount <= max_amount)
 
-    # Get total count for pagination
-    total_count = query.count()
+    # Compute aggregates and the total count on ALL filtered data (before pagination)
+    aggregates, total_count = _compute_aggregates(query)
 
-    # Get filtered transactions for aggregates (before pagination)
-    all_filtered = query.all()
-
-    # Apply pagination
-    offset = (page - 1) * page_size
-    paginated_query = query.order_by(Transaction.date.desc()).offset(offset).limit(page_size)
-    rows = paginated_query.all()
+    # Apply pagination: seek past the cursor when given, otherwise fall back to OFFSET
+    paginated_query = query.with_entities(*_TRANSACTION_RESPONSE_COLUMNS).order_by(
+        Transaction.date.desc(), Transaction.id.desc()
+    )
+    if cursor_date is not None:
+        paginated_query = paginated_query.filter(
+            tuple_(Transaction.date, Transaction.id) < (cursor_date, cursor_id)
+        )
+    else:
+        paginated_query = paginated_query.offset((page - 1) * page_size)
+    # One extra row tells whether another page follows
+    rows = paginated_query.limit(page_size + 1).all()
 
-    # Compute aggregates on ALL filtered data
-    aggregates = _compute_aggregates(all_filtered)
+    next_cursor = None
+    if len(rows) > page_size:
+        rows = rows[:page_size]
+        next_cursor = {"date": rows[-1].date, "id": rows[-1].id}
 
     # Build response
     return TransactionViewResponse(
         filters={
             "account_id": account_id,
-            "start_date": start_date.isoformat() if start_date else None,
-            "end_date": end_date.isoformat() if end_date else None,
+            "start_date": start_date,
+            "end_date": end_date,
             "date_range": date_range.value if date_range else None,
             "category": category,
             "merchant_query": merchant_query,
@@ -399,47 +525,69 @@ def get_transactions_view(
         pagination={
             "page": page,
             "page_size": page_size,
-            "total_count": total_count
+            "total_count": total_count,
+            "next_cursor": next_cursor
         },
-        rows=[TransactionResponse.model_validate(row) for row in rows],
+        rows=_transactions_adapter.validate_python(rows),
         aggregates=aggregates
     )
 
 
-def _compute_aggregates(transactions: List[Transaction]) -> TransactionAggregates:
-    """Compute aggregate statistics on a list of transactions"""
+def _compute_aggregates(query) -> tuple[TransactionAggregates, int]:
+    """
+    Compute aggregate statistics and the row count for a filtered transaction query.
+
+    A single GROUP BY (date, category) scan does the summing in SQL, so only
+    O(categories x days) rows come back; they are folded into the per-category,
+    per-day and overall totals here. Rows arrive newest day first, so each day's
+    net is summed from consecutive rows with no sort in Python.
+    """
+    grouped = query.with_entities(
+        Transaction.category,
+        Transaction.date,
+        func.sum(Transaction.amount).label("net"),
+        func.sum(case((Transaction.amount < 0, Transaction.amount), else_=0)).label("spent"),
+        func.sum(case((Transaction.amount >= 0, Transaction.amount), else_=0)).label("income"),
+        func.count(Transaction.id).label("cnt")
+    ).group_by(
+        Transaction.date, Transaction.category
+    ).order_by(Transaction.date.desc()).all()
+
     total_spent = 0.0
     total_income = 0.0
+    total_count = 0
     by_category = defaultdict(float)
-    by_day = defaultdict(float)
+    day_list = []  # DayAggregate per day, descending order
 
-    for txn in transactions:
-        if txn.amount < 0:
-            total_spent += txn.amount
-        else:
-            total_income += txn.amount
+    for day, day_rows in groupby(grouped, key=attrgetter("date")):
+        day_net = 0.0
+        for row in day_rows:
+            total_spent += row.spent
+            total_income += row.income
+            total_count += row.cnt
 
-        by_category[txn.category] += txn.amount
-        by_day[txn.date.isoformat()] += txn.amount
+            by_category[row.category] += row.net
+            day_net += row.net
 
-    # Convert by_day to list of DayAggregate (descending order)
-    day_list = [
-        DayAggregate(date=day, net=net)
-        for day, net in sorted(by_day.items(), reverse=True)
-    ]
+        day_list.append(DayAggregate(date=day.isoformat(), net=day_net))
 
-    return TransactionAggregates(
+    aggregates = TransactionAggregates(
         total_spent=total_spent,
         total_income=total_income,
         by_category=dict(by_category),
         by_day=day_list
     )
+    return aggregates, total_count
 
 
 def _get_date_range(date_range: DateRangeEnum) -> tuple[date, date]:
     """Convert date_range enum to start_date and end_date"""
-    today = date.today()
+    return _date_range_for_day(date_range, date.today())
+
 
+@lru_cache(maxsize=32)
+def _date_range_for_day(date_range: DateRangeEnum, today: date) -> tuple[date, date]:
+    """Resolve a date_range relative to a given day; memoized since it only changes daily."""
     if date_range == DateRangeEnum.last_7_days:
         start = today - timedelta(days=7)
         end = today
@@ -487,7 +635,6 @@ def update_transaction_note(
 
     transaction.note_user = update.note_user
     db.commit()
-    db.refresh(transaction)
 
     return transaction
 
@@ -511,7 +658,8 @@ def update_transaction_category(
     transaction.category = update.category
     transaction.category_source = "user"
     db.commit()
-    db.refresh(transaction)
+    cache.invalidate("dashboard", user_id)
+    cache.invalidate("analyze_merchants", user_id)
 
     return transaction
 
@@ -539,7 +687,8 @@ def update_transaction(
         transaction.amount = update.amount
 
     db.commit()
-    db.refresh(transaction)
+    cache.invalidate("dashboard", user_id)
+    cache.invalidate("analyze_merchants", user_id)
 
     return transaction
 
@@ -581,13 +730,18 @@ def delete_transactions_batch(
     if not transaction_ids:
         raise HTTPException(status_code=400, detail="No transaction IDs provided")
 
-    # Delete only transactions belonging to this user
-    deleted_count = db.query(Transaction).filter(
-        Transaction.id.in_(transaction_ids),
-        Transaction.user_id == user_id
-    ).delete(synchronize_session=False)
+    # Delete only transactions belonging to this user, in bounded IN-lists
+    # (SQLite caps bound parameters per statement); one commit covers all chunks
+    deleted_count = 0
+    for i in range(0, len(transaction_ids), DELETE_CHUNK_SIZE):
+        deleted_count += db.query(Transaction).filter(
+            Transaction.id.in_(transaction_ids[i:i + DELETE_CHUNK_SIZE]),
+            Transaction.user_id == user_id
+        ).delete(synchronize_session=False)
 
     db.commit()
+    cache.invalidate("dashboard", user_id)
+    cache.invalidate("analyze_merchants", user_id)
 
     return {"deleted_count": deleted_count}
 
@@ -642,31 +796,39 @@ def detect_recurring_transactions(
     Parameters:
     - min_occurrences: Minimum number of transactions to consider as recurring (default: 3)
     """
-    # Get all transactions grouped by merchant
-    merchant_groups = db.query(
+    # One pass over the user's rows: per-merchant count/average ride along as
+    # window aggregates next to each row's recency rank, so qualifying merchants
+    # and their 10 most recent transactions come back from a single query
+    merchant_window = {"partition_by": Transaction.merchant_key}
+    ranked = db.query(
+        Transaction.id,
         Transaction.merchant_key,
-        func.count(Transaction.id).label('count'),
-        func.avg(Transaction.amount).label('avg_amount'),
-        func.max(Transaction.date).label('last_date')
+        Transaction.date,
+        Transaction.description_raw,
+        Transaction.category,
+        func.row_number().over(
+            order_by=(Transaction.date.desc(), Transaction.id.desc()), **merchant_window
+        ).label('rn'),
+        func.count(Transaction.id).over(**merchant_window).label('count'),
+        func.avg(Transaction.amount).over(**merchant_window).label('avg_amount')
     ).filter(
         Transaction.user_id == user_id
-    ).group_by(
-        Transaction.merchant_key
-    ).having(
-        func.count(Transaction.id) >= min_occurrences
-    ).all()
+    ).subquery()
+    recent_rows = db.query(ranked).filter(
+        ranked.c.count >= min_occurrences,
+        ranked.c.rn <= 10
+    ).order_by(ranked.c.merchant_key, ranked.c.rn).all()
 
-    recurring_list = []
+    recent_by_merchant = defaultdict(list)
+    for row in recent_rows:
+        recent_by_merchant[row.merchant_key].append(row)
 
-    for group in merchant_groups:
-        # Get sample transactions for this merchant
-        transactions = db.query(Transaction).filter(
-            Transaction.user_id == user_id,
-            Transaction.merchant_key == group.merchant_key
-        ).order_by(Transaction.date.desc()).limit(10).all()
+    recurring_list = []
 
-        if not transactions:
-            continue
+    for transactions in recent_by_merchant.values():
+        # Sample transactions are most recent first; the first row carries the
+        # merchant-wide count and average
+        group = transactions[0]
 
         # Calculate frequency
         if len(transactions) >= 2:
@@ -708,7 +870,7 @@ def detect_recurring_transactions(
                 average_amount=float(group.avg_amount),
                 frequency=frequency,
                 transaction_count=group.count,
-                last_transaction_date=group.last_date,
+                last_transaction_date=group.date,
                 next_expected_date=next_expected,
                 sample_transactions=[t.id for t in transactions[:5]]
             )
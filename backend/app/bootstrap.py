@@ -0,0 +1,242 @@
+"""
+Schema bootstrap: table creation, ad-hoc migrations and the demo-user seed.
+
+Runs at app startup unless RUN_SCHEMA_BOOTSTRAP is disabled. Serverless
+deployments should disable it so cold starts skip the inspection and DDL
+round-trips, and run it once per deploy instead:
+
+    python -m app.bootstrap
+"""
+
+import logging
+
+from sqlalchemy import text, inspect, update, func
+from sqlalchemy.dialects.postgresql import JSONB
+
+from app.core.config import settings
+from app.db.session import engine, is_sqlite, dialect_insert
+from app.db.base import Base
+from app.models.user import User
+from app.prompts.recurring_insights import MONTHLY_MULTIPLIERS
+
+
+def run_migrations():
+    """Run any needed database migrations on startup."""
+    logger = logging.getLogger(__name__)
+
+    with engine.connect() as conn:
+        inspector = inspect(engine)
+
+        # Reflect the columns of every migrated table in one round-trip
+        reflected = inspector.get_multi_columns(
+            filter_names=['transactions', 'users', 'user_categories', 'recurring_cache', 'recurring_insights']
+        )
+        columns = {
+            table: {col['name']: col['type'] for col in cols}
+            for (_schema, table), cols in reflected.items()
+        }
+
+        # Check if is_expense column exists in transactions table
+        tx_columns = columns['transactions']
+
+        if 'is_expense' not in tx_columns:
+            logger.info("Adding is_expense column to transactions table...")
+
+            # Add the column with default value
+            conn.execute(text(
+                "ALTER TABLE transactions ADD COLUMN is_expense BOOLEAN DEFAULT 1 NOT NULL"
+            ))
+
+            # Update existing rows based on amount
+            conn.execute(text(
+                "UPDATE transactions SET is_expense = (amount < 0)"
+            ))
+
+            # Create composite index
+            conn.execute(text(
+                "CREATE INDEX IF NOT EXISTS ix_transactions_user_expense_date "
+                "ON transactions(user_id, is_expense, date)"
+            ))
+
+            conn.commit()
+            logger.info("Migration complete: is_expense column added and populated")
+
+        if 'updated_at' not in tx_columns:
+            logger.info("Adding updated_at column to transactions table...")
+
+            conn.execute(text("ALTER TABLE transactions ADD COLUMN updated_at TIMESTAMP"))
+
+            # Existing rows were last written when they were created
+            conn.execute(text("UPDATE transactions SET updated_at = created_at"))
+            # Match the model's NOT NULL (SQLite can't alter an existing column)
+            if not is_sqlite:
+                conn.execute(text(
+                    "ALTER TABLE transactions ALTER COLUMN updated_at SET NOT NULL"
+                ))
+
+            conn.commit()
+            logger.info("Migration complete: updated_at column added to transactions")
+
+        # Auth columns migration for users table
+        user_columns = columns['users']
+
+        if 'hashed_password' not in user_columns:
+            logger.info("Adding authentication columns to users table...")
+
+            # Add auth columns
+            conn.execute(text("ALTER TABLE users ADD COLUMN hashed_password VARCHAR"))
+            conn.execute(text("ALTER TABLE users ADD COLUMN name VARCHAR"))
+            conn.execute(text("ALTER TABLE users ADD COLUMN avatar_url VARCHAR"))
+            conn.execute(text("ALTER TABLE users ADD COLUMN google_id VARCHAR"))
+            conn.execute(text("ALTER TABLE users ADD COLUMN is_active BOOLEAN DEFAULT 1"))
+            conn.execute(text("ALTER TABLE users ADD COLUMN is_demo BOOLEAN DEFAULT 0"))
+            conn.execute(text("ALTER TABLE users ADD COLUMN updated_at DATETIME"))
+
+            # Mark user 1 as demo account
+            conn.execute(text("UPDATE users SET is_demo = 1 WHERE id = 1"))
+
+            # Create index for google_id
+            conn.execute(text(
+                "CREATE UNIQUE INDEX IF NOT EXISTS ix_users_google_id ON users(google_id)"
+            ))
+
+            conn.commit()
+            logger.info("Migration complete: authentication columns added to users table")
+
+        # Last-write timestamp behind the categories ETag
+        category_columns = columns['user_categories']
+
+        if 'updated_at' not in category_columns:
+            logger.info("Adding updated_at column to user_categories table...")
+
+            conn.execute(text("ALTER TABLE user_categories ADD COLUMN updated_at TIMESTAMP"))
+            conn.execute(text(
+                "UPDATE user_categories SET updated_at = COALESCE(created_at, CURRENT_TIMESTAMP)"
+            ))
+            if not is_sqlite:
+                conn.execute(text(
+                    "ALTER TABLE user_categories ALTER COLUMN updated_at SET NOT NULL"
+                ))
+
+            conn.commit()
+            logger.info("Migration complete: updated_at column added to user_categories")
+
+        # Precomputed monthly amount for recurring payments
+        recurring_columns = columns['recurring_cache']
+
+        if 'monthly_amount' not in recurring_columns:
+            logger.info("Adding monthly_amount column to recurring_cache table...")
+
+            conn.execute(text("ALTER TABLE recurring_cache ADD COLUMN monthly_amount FLOAT"))
+
+            # Backfill from the same multipliers as calculate_monthly_amount
+            multiplier_cases = " ".join(
+                f"WHEN '{frequency}' THEN {float(multiplier)!r}"
+                for frequency, multiplier in MONTHLY_MULTIPLIERS.items()
+            )
+            conn.execute(text(
+                "UPDATE recurring_cache SET monthly_amount = typical_amount * "
+                f"CASE frequency {multiplier_cases} ELSE 1 END"
+            ))
+
+            conn.commit()
+            logger.info("Migration complete: monthly_amount column added to recurring_cache")
+
+        # Insights payloads were created as text JSON on PostgreSQL before moving to JSONB
+        insights_columns = columns['recurring_insights']
+
+        if not is_sqlite and not isinstance(insights_columns['summary'], JSONB):
+            logger.info("Converting recurring_insights JSON columns to JSONB...")
+
+            for column in ('summary', 'insights', 'upcoming'):
+                conn.execute(text(
+                    f"ALTER TABLE recurring_insights ALTER COLUMN {column} "
+                    f"TYPE JSONB USING {column}::jsonb"
+                ))
+
+            conn.commit()
+            logger.info("Migration complete: recurring_insights columns converted to JSONB")
+
+    # Composite indexes for the per-user filters hit on every request.
+    # New databases get these from the models; existing ones are backfilled here.
+    # PostgreSQL builds them CONCURRENTLY (outside a transaction) so writes aren't blocked.
+    composite_indexes = [
+        "ix_transactions_user_date_id ON transactions(user_id, date DESC, id DESC)",
+        "ix_transactions_user_category_amount ON transactions(user_id, category, amount)",
+        "ix_transactions_user_merchant_date ON transactions(user_id, merchant_key, date)",
+        "ix_transactions_user_updated ON transactions(user_id, updated_at)",
+        "ix_user_categories_user_sort ON user_categories(user_id, sort_order)",
+        "ix_user_categories_user_name_lower ON user_categories(user_id, lower(name))",
+        "ix_merchant_cache_user_cat ON merchant_caches(user_id, suggested_category)",
+    ]
+    concurrently = "" if is_sqlite else "CONCURRENTLY "
+
+    # Superseded by a wider index above. Every transaction query filters on
+    # user_id, so single-column indexes on other columns are never chosen over
+    # the composites and only slow down writes.
+    dropped_indexes = [
+        "ix_transactions_user_category",
+        "ix_transactions_user_date",
+        "ix_transactions_id",  # duplicates the primary key
+        "ix_transactions_date",
+        "ix_transactions_merchant_key",
+        "ix_transactions_category",
+        "ix_transactions_is_expense",
+        "ix_merchant_caches_merchant_key",  # always probed with user_id via uq_user_merchant
+    ]
+
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        for index_sql in composite_indexes:
+            conn.execute(text(f"CREATE INDEX {concurrently}IF NOT EXISTS {index_sql}"))
+        for index_name in dropped_indexes:
+            conn.execute(text(f"DROP INDEX {concurrently}IF EXISTS {index_name}"))
+
+
+def seed_demo_user():
+    """Create the demo user, or flag an existing user with that ID as the demo user.
+
+    Written as an insert-or-skip followed by a conditional update so workers
+    booting at the same time don't race on the primary key.
+    """
+    logger = logging.getLogger(__name__)
+    with engine.begin() as conn:
+        # Create demo user unless the ID is taken
+        created = conn.execute(
+            dialect_insert(User).values(
+                id=settings.DEMO_USER_ID,
+                email="demo@example.com",
+                name="Demo User",
+                is_demo=True,
+                is_active=True
+            ).on_conflict_do_nothing(index_elements=["id"])
+        ).rowcount
+        if created:
+            logger.info(f"Created demo user with ID {settings.DEMO_USER_ID}")
+            return
+
+        # Mark existing user as demo
+        marked = conn.execute(
+            update(User)
+            .where(User.id == settings.DEMO_USER_ID, User.is_demo.is_(False))
+            .values(
+                is_demo=True,
+                email=func.coalesce(User.email, "demo@example.com"),
+                name=func.coalesce(User.name, "Demo User")
+            )
+        ).rowcount
+        if marked:
+            logger.info(f"Marked user {settings.DEMO_USER_ID} as demo user")
+
+
+def bootstrap_schema():
+    """Create tables, apply migrations and seed the demo user."""
+    Base.metadata.create_all(bind=engine)
+    run_migrations()
+    seed_demo_user()
+
+
+if __name__ == "__main__":
+    from app.core.logging_config import setup_logging
+
+    setup_logging()
+    bootstrap_schema()
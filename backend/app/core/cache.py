@@ -0,0 +1,74 @@
+"""
+In-process response caches for small, read-heavy per-user listings.
+
+Entries are keyed by (namespace, user_id) and expire after a short TTL. An entry
+may hold several variants (e.g. one per date range), all dropped together.
+Endpoints that modify the underlying rows call invalidate() after committing,
+which only reaches the process that handled the write. Hence the app runs a
+single worker by default, and on serverless deployments (many concurrent
+function instances) the cache is bypassed entirely.
+"""
+
+import threading
+from typing import Any, Callable, Hashable
+
+from cachetools import TTLCache
+
+from app.db.session import is_serverless
+
+RESPONSE_CACHE_TTL = 60  # seconds
+
+_response_cache = TTLCache(maxsize=10_000, ttl=RESPONSE_CACHE_TTL)
+_response_cache_lock = threading.Lock()
+
+# Bumped by invalidate(); a value built while its key's generation changed
+# may predate the write and is returned but not stored.
+_generations = {}  # (namespace, user_id) -> int
+
+
+def get_or_set(
+    namespace: str,
+    user_id: int,
+    builder: Callable[[], Any],
+    variant: Hashable = None
+) -> Any:
+    """
+    Return the cached value for a user, building and storing it on a miss.
+
+    Args:
+        namespace: Cache namespace, e.g. "categories"
+        user_id: Owner of the cached data
+        builder: Zero-argument callable producing the value on a miss
+        variant: Optional sub-key for parameterized responses
+
+    Returns:
+        Cached or freshly built value
+    """
+    if is_serverless:
+        return builder()
+
+    key = (namespace, user_id)
+
+    with _response_cache_lock:
+        variants = _response_cache.get(key)
+        generation = _generations.get(key, 0)
+    if variants is not None and variant in variants:
+        return variants[variant]
+
+    value = builder()
+    with _response_cache_lock:
+        if _generations.get(key, 0) != generation:
+            return value
+        # Copy so readers never see a dict being mutated
+        variants = dict(_response_cache.get(key) or {})
+        variants[variant] = value
+        _response_cache[key] = variants
+    return value
+
+
+def invalidate(namespace: str, user_id: int) -> None:
+    """Drop a user's cached entries (all variants) for a namespace after their data changes."""
+    key = (namespace, user_id)
+    with _response_cache_lock:
+        _response_cache.pop(key, None)
+        _generations[key] = _generations.get(key, 0) + 1
@@ -1,5 +1,13 @@
+import os
 from pydantic_settings import BaseSettings
-from typing import Optional, List
+from typing import Optional, List, Tuple
+
+# Frontend origins that are always allowed, on top of CORS_ORIGINS
+DEFAULT_CORS_ORIGINS = (
+    "https://clearflow-front.vercel.app",  # Production frontend
+    "http://localhost:5173",                # Local development
+    "http://localhost:3000",
+)
 
 
 class Settings(BaseSettings):
@@ -12,16 +20,39 @@ class Settings(BaseSettings):
     # Database - SQLite for dev, PostgreSQL for production
     DATABASE_URL: str = "sqlite:///./finance.db"
 
+    # PostgreSQL connection pool (long-lived servers; serverless runs unpooled)
+    DB_POOL_SIZE: int = 20
+    DB_MAX_OVERFLOW: int = 40
+    DB_POOL_RECYCLE: int = 1800  # seconds
+    DB_POOL_PRE_PING: bool = False  # SELECT 1 on every checkout
+
+    # Create tables, run migrations and seed the demo user when the app starts.
+    # Disable on serverless hosts and run `python -m app.bootstrap` per deploy.
+    RUN_SCHEMA_BOOTSTRAP: bool = True
+
     # AI Settings
     OPENROUTER_API_KEY: Optional[str] = None
     OPENROUTER_MODEL: str = "amazon/nova-2-lite-v1:free"
     OPENROUTER_BASE_URL: str = "https://openrouter.ai/api/v1"
 
+    # Server processes when running `python -m app.main` in production.
+    # The response and LLM caches are per process and invalidated only in the
+    # process that handled the write, so more than one worker serves stale data
+    # until the TTLs expire. Raise it only with shared cache storage.
+    WEB_CONCURRENCY: int = 1
+
+    # Worker threads for blocking calls offloaded from the event loop (bcrypt, LLM requests)
+    THREAD_POOL_SIZE: int = min(32, (os.cpu_count() or 1) + 4)
+
     # JWT Settings
     JWT_SECRET_KEY: str = "change-this-secret-key-in-production"  # Generate with: openssl rand -hex 32
     JWT_ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60 * 24 * 7  # 7 days
 
+    # bcrypt cost for new password hashes; pick with security.pick_bcrypt_rounds()
+    # on the target host. Stored hashes at another cost are rehashed on login.
+    BCRYPT_ROUNDS: int = 12
+
     # Google OAuth Settings
     GOOGLE_CLIENT_ID: Optional[str] = None
     GOOGLE_CLIENT_SECRET: Optional[str] = None
@@ -38,6 +69,11 @@ class Settings(BaseSettings):
         """Parse CORS_ORIGINS string into list."""
         return [origin.strip() for origin in self.CORS_ORIGINS.split(",") if origin.strip()]
 
+    @property
+    def cors_origins(self) -> Tuple[str, ...]:
+        """Default plus configured origins, deduplicated and in a stable order."""
+        return tuple(sorted({*DEFAULT_CORS_ORIGINS, *self.cors_origins_list}))
+
     @property
     def is_production(self) -> bool:
         """Check if running in production mode."""
@@ -0,0 +1,31 @@
+"""
+Conditional GET helpers.
+
+Endpoints derive an ETag from a cheap signature of the data behind a response
+and answer 304 Not Modified when the client's If-None-Match already holds it,
+skipping the expensive part of the request and the response body.
+"""
+
+import hashlib
+from typing import Any, Optional
+
+from fastapi import Response
+
+
+def make_etag(*parts: Any) -> str:
+    """Build a strong ETag from the given signature parts."""
+    digest = hashlib.blake2b(repr(parts).encode(), digest_size=8).hexdigest()
+    return f'"{digest}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Check an If-None-Match header value (possibly a list of tags) against an ETag."""
+    if not if_none_match:
+        return False
+    candidates = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+    return "*" in candidates or etag in candidates
+
+
+def not_modified(etag: str) -> Response:
+    """Empty 304 response carrying the current ETag."""
+    return Response(status_code=304, headers={"ETag": etag})
@@ -0,0 +1,91 @@
+"""
+In-process cache of LLM chat completions, keyed by model and prompt.
+
+Re-running recurring analysis over unchanged data builds byte-identical
+prompts; those are answered from here instead of paying for another API call.
+Prompts embed the transactions they describe, so new data changes the key and
+misses naturally. Entries expire after LLM_CACHE_TTL; each worker process keeps
+its own cache.
+"""
+
+import hashlib
+import logging
+import threading
+from typing import Any, Dict, List, Optional
+
+import orjson
+from cachetools import TTLCache
+
+from app.core.config import settings
+
+LLM_CACHE_TTL = 3600  # seconds
+
+logger = logging.getLogger(__name__)
+
+_completion_cache = TTLCache(maxsize=1_000, ttl=LLM_CACHE_TTL)
+_completion_cache_lock = threading.Lock()
+_stats = {"hits": 0, "misses": 0}
+
+
+def _cache_key(model: str, messages: List[Dict[str, str]], options: Dict[str, Any]) -> bytes:
+    """Digest of everything that determines the completion."""
+    payload = orjson.dumps(
+        {"model": model, "messages": messages, "options": options},
+        option=orjson.OPT_SORT_KEYS
+    )
+    return hashlib.blake2b(payload, digest_size=16).digest()
+
+
+def cached_chat_completion(
+    client,
+    messages: List[Dict[str, str]],
+    use_cache: bool = True,
+    **options
+) -> Optional[str]:
+    """
+    Run a chat completion against the configured model, reusing a cached answer
+    for an identical request.
+
+    Only deterministic requests (temperature=0 passed explicitly) are cached;
+    sampled answers always go to the API.
+
+    Blocking; call it via asyncio.to_thread from async code.
+
+    Args:
+        client: OpenAI client
+        messages: Chat messages
+        use_cache: False to skip the cache entirely (e.g. on a forced refresh)
+        **options: Extra arguments for chat.completions.create (part of the key)
+
+    Returns:
+        Content of the first choice
+    """
+    model = settings.OPENROUTER_MODEL
+
+    if not use_cache or options.get("temperature") != 0:
+        response = client.chat.completions.create(model=model, messages=messages, **options)
+        return response.choices[0].message.content
+
+    key = _cache_key(model, messages, options)
+
+    with _completion_cache_lock:
+        content = _completion_cache.get(key)
+        _stats["hits" if content is not None else "misses"] += 1
+    if content is not None:
+        logger.debug("LLM cache hit (%d hits, %d misses)", _stats["hits"], _stats["misses"])
+        return content
+
+    response = client.chat.completions.create(model=model, messages=messages, **options)
+    content = response.choices[0].message.content
+
+    # Don't pin empty answers; the next identical request retries the API
+    if content:
+        with _completion_cache_lock:
+            _completion_cache[key] = content
+    return content
+
+
+def cache_stats() -> Dict[str, int]:
+    """Hit and miss counts since the process started."""
+    with _completion_cache_lock:
+        return dict(_stats, size=len(_completion_cache))
@@ -3,14 +3,86 @@ Logging configuration for the application.
 
 Sets up structured logging:
 - Production (Vercel): Console only (read-only filesystem)
-- Development: Console + rotating file logs
+- Development: Console + rotating file logs, written by a background listener thread
 """
 
+import atexit
 import logging
 import logging.handlers
 import os
+import queue
+import threading
+import time
 from pathlib import Path
 
+CATEGORIZATION_LOGGER = logging.getLogger("categorization")
+
+# File handlers buffer this many records, flushing early on ERROR and at least
+# every LOG_FLUSH_INTERVAL seconds, so writes happen in batches
+LOG_BUFFER_CAPACITY = 512
+LOG_FLUSH_INTERVAL = 0.5
+
+# Records written between file-size checks; a log file may overshoot maxBytes
+# by at most this many records before it rolls over
+ROLLOVER_CHECK_INTERVAL = 256
+
+_log_buffers = []
+
+
+class _LazyRotatingFileHandler(logging.handlers.RotatingFileHandler):
+    """RotatingFileHandler that checks the file size every few records, not on every emit."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._records_since_check = 0
+
+    def shouldRollover(self, record: logging.LogRecord) -> bool:
+        self._records_since_check += 1
+        if self._records_since_check < ROLLOVER_CHECK_INTERVAL:
+            return False
+        self._records_since_check = 0
+        return super().shouldRollover(record)
+
+
+def _flush_log_buffers_periodically():
+    """Bound how long a buffered record can wait before reaching disk."""
+    while True:
+        time.sleep(LOG_FLUSH_INTERVAL)
+        for buffer in list(_log_buffers):
+            buffer.flush()
+
+
+def _buffered(handler: logging.Handler) -> logging.Handler:
+    """Wrap a file handler in a MemoryHandler that writes records in batches."""
+    buffer = logging.handlers.MemoryHandler(
+        LOG_BUFFER_CAPACITY,
+        flushLevel=logging.ERROR,
+        target=handler,
+        flushOnClose=True
+    )
+    buffer.setLevel(handler.level)
+
+    if not _log_buffers:
+        threading.Thread(
+            target=_flush_log_buffers_periodically, name="log-flush", daemon=True
+        ).start()
+    _log_buffers.append(buffer)
+    return buffer
+
+
+def _queued(*handlers: logging.Handler) -> logging.Handler:
+    """
+    Wrap handlers behind a QueueHandler so their file I/O runs on a listener
+    thread instead of the thread that logged the record.
+    """
+    log_queue = queue.SimpleQueue()
+    listener = logging.handlers.QueueListener(
+        log_queue, *[_buffered(handler) for handler in handlers], respect_handler_level=True
+    )
+    listener.start()
+    atexit.register(listener.stop)
+    return logging.handlers.QueueHandler(log_queue)
+
 
 def setup_logging():
     """
@@ -53,7 +125,7 @@ def setup_logging():
             logs_dir.mkdir(exist_ok=True)
 
             # Main application log file
-            app_handler = logging.handlers.RotatingFileHandler(
+            app_handler = _LazyRotatingFileHandler(
                 logs_dir / "app.log",
                 maxBytes=10 * 1024 * 1024,
                 backupCount=5,
@@ -61,10 +133,9 @@ def setup_logging():
             )
             app_handler.setLevel(logging.INFO)
             app_handler.setFormatter(detailed_formatter)
-            root_logger.addHandler(app_handler)
 
             # Error log file
-            error_handler = logging.handlers.RotatingFileHandler(
+            error_handler = _LazyRotatingFileHandler(
                 logs_dir / "errors.log",
                 maxBytes=10 * 1024 * 1024,
                 backupCount=5,
@@ -72,11 +143,10 @@ def setup_logging():
             )
             error_handler.setLevel(logging.ERROR)
             error_handler.setFormatter(detailed_formatter)
-            root_logger.addHandler(error_handler)
+            root_logger.addHandler(_queued(app_handler, error_handler))
 
             # Categorization log file
-            categorization_logger = logging.getLogger("categorization")
-            categorization_handler = logging.handlers.RotatingFileHandler(
+            categorization_handler = _LazyRotatingFileHandler(
                 logs_dir / "categorization.log",
                 maxBytes=10 * 1024 * 1024,
                 backupCount=5,
@@ -84,7 +154,14 @@ def setup_logging():
             )
             categorization_handler.setLevel(logging.INFO)
             categorization_handler.setFormatter(detailed_formatter)
-            categorization_logger.addHandler(categorization_handler)
+
+            # Categorization records go to their own file (plus console and
+            # errors) but not to app.log, so they aren't written twice
+            CATEGORIZATION_LOGGER.handlers = [
+                console_handler,
+                _queued(categorization_handler, error_handler)
+            ]
+            CATEGORIZATION_LOGGER.propagate = False
         except OSError:
             # Filesystem might be read-only, skip file logging
             pass
@@ -95,4 +172,4 @@ def setup_logging():
 
 def get_categorization_logger():
     """Get the categorization-specific logger."""
-    return logging.getLogger("categorization")
+    return CATEGORIZATION_LOGGER
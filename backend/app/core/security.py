@@ -2,17 +2,47 @@
 Security utilities for authentication.
 
 Provides password hashing and JWT token operations.
+
+passlib/bcrypt and python-jose are imported on first use rather than at module
+load, keeping them out of serverless cold starts that never touch auth.
 """
 
-from datetime import datetime, timedelta
-from typing import Optional
-from jose import jwt, JWTError
-from passlib.context import CryptContext
+import hashlib
+import threading
+import time
+from functools import lru_cache
+from typing import Optional, Tuple
+from cachetools import TTLCache
 
 from app.core.config import settings
 
-# Password hashing context
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Decoded access tokens keyed by token digest -> (user_id, exp).
+# A browser presents the same token on every request, so repeat decodes are
+# served from here; the short TTL bounds how long a cached decode lingers.
+_token_cache = TTLCache(maxsize=10_000, ttl=60)
+_token_cache_lock = threading.Lock()
+
+
+@lru_cache(maxsize=1)
+def _pwd_context():
+    """Password hashing context; hashes at a different cost count as needing an update."""
+    from passlib.context import CryptContext
+
+    return CryptContext(
+        schemes=["bcrypt"],
+        deprecated="auto",
+        bcrypt__default_rounds=settings.BCRYPT_ROUNDS,
+        bcrypt__min_rounds=settings.BCRYPT_ROUNDS,
+        bcrypt__max_rounds=settings.BCRYPT_ROUNDS
+    )
+
+
+@lru_cache(maxsize=1)
+def _jwt():
+    """The python-jose jwt module (also exposes JWTError)."""
+    from jose import jwt
+
+    return jwt
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
@@ -26,7 +56,44 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     Returns:
         True if password matches, False otherwise
     """
-    return pwd_context.verify(plain_password, hashed_password)
+    return _pwd_context().verify(plain_password, hashed_password)
+
+
+def verify_and_update_password(
+    plain_password: str,
+    hashed_password: str
+) -> Tuple[bool, Optional[str]]:
+    """
+    Verify a password and rehash it if the stored hash uses a different bcrypt cost.
+
+    Args:
+        plain_password: The plain text password
+        hashed_password: The stored bcrypt hash
+
+    Returns:
+        (matches, new_hash) where new_hash is set only when the caller should
+        persist an upgraded hash
+    """
+    return _pwd_context().verify_and_update(plain_password, hashed_password)
+
+
+def pick_bcrypt_rounds(target_seconds: float = 0.25) -> int:
+    """
+    Find the lowest bcrypt cost whose hash takes at least target_seconds on this machine.
+
+    Intended to be run once on the deployment host to choose BCRYPT_ROUNDS, e.g.
+    python -c "from app.core.security import pick_bcrypt_rounds; print(pick_bcrypt_rounds())"
+    """
+    from passlib.context import CryptContext
+
+    rounds = 10
+    while rounds < 16:
+        start = time.perf_counter()
+        CryptContext(schemes=["bcrypt"], bcrypt__default_rounds=rounds).hash("calibration")
+        if time.perf_counter() - start >= target_seconds:
+            break
+        rounds += 1
+    return rounds
 
 
 def get_password_hash(password: str) -> str:
@@ -39,7 +106,7 @@ def get_password_hash(password: str) -> str:
     Returns:
         Bcrypt hashed password
     """
-    return pwd_context.hash(password)
+    return _pwd_context().hash(password)
 
 
 def create_access_token(user_id: int) -> str:
@@ -52,36 +119,69 @@ def create_access_token(user_id: int) -> str:
     Returns:
         Encoded JWT token string
     """
-    expire = datetime.utcnow() + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+    # Epoch seconds, which is what jose would convert datetimes to anyway
+    now = int(time.time())
     to_encode = {
         "sub": str(user_id),
-        "exp": expire,
-        "iat": datetime.utcnow()
+        "exp": now + settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60,
+        "iat": now
     }
-    return jwt.encode(
+    return _jwt().encode(
         to_encode,
         settings.JWT_SECRET_KEY,
         algorithm=settings.JWT_ALGORITHM
     )
 
 
-def decode_access_token(token: str) -> Optional[int]:
+def decode_token_payload(token: str) -> Optional[dict]:
     """
-    Decode and validate a JWT access token.
+    Decode and validate a JWT access token, returning its claims.
 
     Args:
         token: The JWT token string to decode
 
     Returns:
-        User ID if token is valid, None otherwise
+        Claims dict if token is valid, None otherwise
     """
+    jwt = _jwt()
     try:
-        payload = jwt.decode(
+        return jwt.decode(
             token,
             settings.JWT_SECRET_KEY,
             algorithms=[settings.JWT_ALGORITHM]
         )
-        user_id = payload.get("sub")
-        return int(user_id) if user_id else None
-    except JWTError:
+    except jwt.JWTError:
+        return None
+
+
+def decode_access_token(token: str) -> Optional[int]:
+    """
+    Decode and validate a JWT access token.
+
+    Results are memoized per token for a short TTL; a cached entry is still
+    rejected once the token's own expiry has passed.
+
+    Args:
+        token: The JWT token string to decode
+
+    Returns:
+        User ID if token is valid, None otherwise
+    """
+    # A 16-byte digest is cheaper to compute and store than the full token
+    key = hashlib.blake2b(token.encode(), digest_size=16).digest()
+
+    with _token_cache_lock:
+        cached = _token_cache.get(key)
+    if cached:
+        user_id, exp = cached
+        if exp > time.time():
+            return user_id
+
+    payload = decode_token_payload(token)
+    if not payload or not payload.get("sub"):
         return None
+
+    user_id = int(payload["sub"])
+    with _token_cache_lock:
+        _token_cache[key] = (user_id, payload.get("exp", 0))
+    return user_id
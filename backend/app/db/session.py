@@ -1,30 +1,62 @@
+import os
+import orjson
 from sqlalchemy import create_engine
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.orm import sessionmaker, declarative_base
+from sqlalchemy.pool import NullPool
 from app.core.config import settings
 
 # Determine engine configuration based on database type
 is_sqlite = "sqlite" in settings.DATABASE_URL.lower()
 
+# Vercel sets VERCEL=1; each function instance serves one request at a time,
+# so a pool would only hold sockets open between invocations
+is_serverless = bool(os.environ.get("VERCEL"))
+
+
+def _json_dumps(value) -> str:
+    """orjson encoder for JSON columns; accepts the int keys stdlib json would stringify."""
+    return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS).decode()
+
+
+# JSON columns (recurring insights) are encoded and decoded with orjson
+_json_options = {"json_serializer": _json_dumps, "json_deserializer": orjson.loads}
+
 if is_sqlite:
     # SQLite configuration (development)
     engine = create_engine(
         settings.DATABASE_URL,
         connect_args={"check_same_thread": False},
-        echo=False
+        echo=False,
+        **_json_options
+    )
+elif is_serverless:
+    # PostgreSQL on serverless: open a connection per session, no pool
+    engine = create_engine(
+        settings.DATABASE_URL,
+        poolclass=NullPool,
+        echo=False,
+        **_json_options
     )
 else:
     # PostgreSQL configuration (production) with connection pooling
     engine = create_engine(
         settings.DATABASE_URL,
-        pool_size=20,
-        max_overflow=40,
-        pool_pre_ping=True,  # Verify connections before use
-        pool_recycle=3600,   # Recycle connections after 1 hour
-        echo=False
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_use_lifo=True,  # Reuse the most recent connection; idle extras age out
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+        pool_recycle=settings.DB_POOL_RECYCLE,  # Replace connections before server idle timeouts
+        echo=False,
+        **_json_options
     )
 
-# Create session factory
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# Dialect-specific INSERT construct; supports ON CONFLICT clauses on both backends
+dialect_insert = sqlite.insert if is_sqlite else postgresql.insert
+
+# Create session factory. Objects keep their loaded state after commit rather
+# than re-SELECTing on the next attribute access.
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=engine)
 
 # Create base class for models
 Base = declarative_base()
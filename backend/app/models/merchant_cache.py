@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, UniqueConstraint
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, UniqueConstraint, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from app.db.session import Base
@@ -9,7 +9,7 @@ class MerchantCache(Base):
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
-    merchant_key = Column(String, nullable=False, index=True)
+    merchant_key = Column(String, nullable=False)  # Looked up with user_id via uq_user_merchant
     suggested_category = Column(String, nullable=False)
     suggested_note = Column(String, nullable=False)
     suggested_explanation = Column(String, nullable=False)
@@ -19,7 +19,8 @@ class MerchantCache(Base):
     # Relationships
     user = relationship("User", back_populates="merchant_caches")
 
-    # Unique constraint
+    # Unique constraint, plus an index for category rename cascades
     __table_args__ = (
         UniqueConstraint("user_id", "merchant_key", name="uq_user_merchant"),
+        Index("ix_merchant_cache_user_cat", "user_id", "suggested_category"),
     )
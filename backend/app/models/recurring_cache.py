@@ -20,6 +20,7 @@ class RecurringCache(Base):
     is_recurring = Column(Boolean, default=False)
     frequency = Column(String)  # weekly, bi-weekly, monthly, quarterly, yearly
     typical_amount = Column(Float)
+    monthly_amount = Column(Float)  # typical_amount normalized to a monthly figure
     amount_variance = Column(String)  # fixed, variable
     confidence = Column(String)  # high, medium, low
     category = Column(String)
@@ -3,10 +3,14 @@ Recurring insights cache model for storing AI-generated insights.
 """
 
 from sqlalchemy import Column, Integer, DateTime, ForeignKey, JSON
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from app.db.session import Base
 
+# Binary JSON on PostgreSQL: stored pre-parsed, so reads skip re-parsing the text
+JSONDocument = JSON().with_variant(JSONB(), "postgresql")
+
 
 class RecurringInsights(Base):
     __tablename__ = "recurring_insights"
@@ -15,9 +19,9 @@ class RecurringInsights(Base):
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False, unique=True, index=True)
 
     # Stored insights (JSON)
-    summary = Column(JSON, nullable=False)  # {total_monthly, total_yearly, count, percentage_of_expenses, by_category}
-    insights = Column(JSON, nullable=False)  # [{type, title, message, priority}, ...]
-    upcoming = Column(JSON, nullable=False)  # [{merchant, amount, date, days_until}, ...]
+    summary = Column(JSONDocument, nullable=False)  # {total_monthly, total_yearly, count, percentage_of_expenses, by_category}
+    insights = Column(JSONDocument, nullable=False)  # [{type, title, message, priority}, ...]
+    upcoming = Column(JSONDocument, nullable=False)  # [{merchant, amount, date, days_until}, ...]
 
     # Timestamps
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
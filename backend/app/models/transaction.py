@@ -15,15 +15,15 @@ class CategorySource(str, enum.Enum):
 class Transaction(Base):
     __tablename__ = "transactions"
 
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
     account_id = Column(Integer, ForeignKey("accounts.id"), nullable=False, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
-    date = Column(Date, nullable=False, index=True)
+    date = Column(Date, nullable=False)
     description_raw = Column(String, nullable=False)
-    merchant_key = Column(String, nullable=False, index=True)
+    merchant_key = Column(String, nullable=False)
     amount = Column(Float, nullable=False)
     currency = Column(String, default="CAD", nullable=False)
-    category = Column(String, default="Uncategorized", nullable=False, index=True)
+    category = Column(String, default="Uncategorized", nullable=False)
     category_source = Column(
         SQLEnum(CategorySource),
         default=CategorySource.uncategorized,
@@ -31,12 +31,18 @@ class Transaction(Base):
     )
     note_user = Column(String, nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    # Bumped on every write; with the row count it forms the /view ETag signature
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
     # Expense flag for fast filtering (True = expense/negative, False = income/positive)
-    is_expense = Column(Boolean, default=True, nullable=False, index=True)
+    is_expense = Column(Boolean, default=True, nullable=False)
 
-    # Composite index for recurring detection queries
+    # Composite indexes for recurring detection and per-user listing/filtering
     __table_args__ = (
         Index('ix_transactions_user_expense_date', 'user_id', 'is_expense', 'date'),
+        Index('ix_transactions_user_date_id', user_id, date.desc(), id.desc()),
+        Index('ix_transactions_user_category_amount', 'user_id', 'category', 'amount'),
+        Index('ix_transactions_user_merchant_date', 'user_id', 'merchant_key', 'date'),
+        Index('ix_transactions_user_updated', 'user_id', 'updated_at'),
     )
 
     # Relationships
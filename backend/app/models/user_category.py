@@ -5,14 +5,14 @@ Each user can have their own set of categories for transactions.
 """
 
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, UniqueConstraint
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, UniqueConstraint, Index, func
 from sqlalchemy.orm import relationship
 
 from app.db.session import Base
 
 
-# Default categories created for new users
-DEFAULT_USER_CATEGORIES = [
+# Default categories created for new users (immutable; shared across requests)
+DEFAULT_USER_CATEGORIES = (
     {"name": "Groceries", "color": "#22c55e", "sort_order": 1, "is_system": False},
     {"name": "Rent", "color": "#ef4444", "sort_order": 2, "is_system": False},
     {"name": "Transport", "color": "#f59e0b", "sort_order": 3, "is_system": False},
@@ -22,7 +22,9 @@ DEFAULT_USER_CATEGORIES = [
     {"name": "Utilities", "color": "#6366f1", "sort_order": 7, "is_system": False},
     {"name": "Income", "color": "#10b981", "sort_order": 8, "is_system": False},
     {"name": "Other", "color": "#6b7280", "sort_order": 99, "is_system": True},
-]
+)
+
+DEFAULT_USER_CATEGORY_NAMES = tuple(cat["name"] for cat in DEFAULT_USER_CATEGORIES)
 
 
 class UserCategory(Base):
@@ -43,13 +45,17 @@ class UserCategory(Base):
     sort_order = Column(Integer, default=0)
     is_system = Column(Boolean, default=False)  # True for "Other" (uneditable)
     created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
 
     # Relationship to user
     user = relationship("User", back_populates="categories")
 
     # Unique constraint: user can't have duplicate category names
+    # Indexes back the sorted listing and the case-insensitive name lookups
     __table_args__ = (
         UniqueConstraint('user_id', 'name', name='uq_user_category_name'),
+        Index('ix_user_categories_user_sort', 'user_id', 'sort_order'),
+        Index('ix_user_categories_user_name_lower', user_id, func.lower(name)),
     )
 
     def __repr__(self):
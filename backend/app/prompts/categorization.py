@@ -7,43 +7,8 @@ Modify these templates to adjust how the AI categorizes transactions.
 from typing import List, Dict
 
 
-def get_batch_categorization_prompt(
-    transactions: List[Dict],
-    available_categories: List[str]
-) -> str:
-    """
-    Generate a prompt for batch transaction categorization.
-
-    Args:
-        transactions: List of transaction dicts with id, description_raw, merchant_key, amount, date
-        available_categories: List of valid category names
-
-    Returns:
-        Formatted prompt string
-    """
-    categories_list = ", ".join(available_categories)
-
-    # Build transaction list for the prompt
-    transaction_lines = []
-    for txn in transactions:
-        amount_str = f"${abs(txn['amount']):.2f}"
-        txn_type = "expense" if txn['amount'] < 0 else "income"
-        description = txn.get('description_raw', txn.get('merchant', 'Unknown'))
-        merchant_key = txn.get('merchant_key', '')
-
-        # Include both description_raw and merchant_key for better context
-        merchant_info = f"\"{description}\""
-        if merchant_key and merchant_key != description:
-            merchant_info += f" (normalized: {merchant_key})"
-
-        transaction_lines.append(
-            f"  - ID: {txn['id']}, Merchant: {merchant_info}, "
-            f"Amount: {amount_str} ({txn_type}), Date: {txn['date']}"
-        )
-
-    transactions_text = "\n".join(transaction_lines)
-
-    prompt = f"""You are a financial transaction categorization expert. Your task is to categorize transactions into appropriate spending categories.
+# Static text of the batch prompt; only the category and transaction lists vary per call
+BATCH_CATEGORIZATION_TEMPLATE = """You are a financial transaction categorization expert. Your task is to categorize transactions into appropriate spending categories.
 
 **Available Categories:**
 {categories_list}
@@ -93,7 +58,45 @@ Example:
 
 **CRITICAL:** Return ONLY the JSON array. No additional text before or after."""
 
-    return prompt
+
+def get_batch_categorization_prompt(
+    transactions: List[Dict],
+    available_categories: List[str]
+) -> str:
+    """
+    Generate a prompt for batch transaction categorization.
+
+    Args:
+        transactions: List of transaction dicts with id, description_raw, merchant_key, amount, date
+        available_categories: List of valid category names
+
+    Returns:
+        Formatted prompt string
+    """
+    transactions_text = "\n".join(_format_transaction_line(txn) for txn in transactions)
+
+    return BATCH_CATEGORIZATION_TEMPLATE.format(
+        categories_list=", ".join(available_categories),
+        transactions_text=transactions_text
+    )
+
+
+def _format_transaction_line(txn: Dict) -> str:
+    """One transaction as a line of the batch prompt."""
+    amount = txn['amount']
+    txn_type = "expense" if amount < 0 else "income"
+    description = txn['description_raw'] if 'description_raw' in txn else txn.get('merchant', 'Unknown')
+    merchant_key = txn.get('merchant_key', '')
+
+    # Include both description_raw and merchant_key for better context
+    merchant_info = f"\"{description}\""
+    if merchant_key and merchant_key != description:
+        merchant_info += f" (normalized: {merchant_key})"
+
+    return (
+        f"  - ID: {txn['id']}, Merchant: {merchant_info}, "
+        f"Amount: ${abs(amount):.2f} ({txn_type}), Date: {txn['date']}"
+    )
 
 
 def get_single_categorization_prompt(
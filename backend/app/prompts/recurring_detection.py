@@ -5,17 +5,54 @@ This module generates prompts for AI to verify if a set of transactions
 from the same merchant represent a recurring payment pattern.
 """
 
-from typing import List, Dict
+from typing import List, Dict, Tuple
 from datetime import date
 
 
+def _format_transaction_lines(transactions: List[Dict], indent: str = "") -> str:
+    """Numbered transaction list, one "N. date: -$amount (note: ...)" line per transaction."""
+    return "\n".join(
+        f"{indent}{i}. {txn['date']}: -${abs(txn['amount']):.2f}"
+        + (f' (note: "{note}")' if (note := txn.get("note")) else "")
+        for i, txn in enumerate(transactions, 1)
+    )
+
+
+# Instructions and response schema shared by every single-merchant call. They
+# go in the system message so the prompt prefix is identical across calls and
+# providers can serve it from their prompt cache.
+RECURRING_DETECTION_SYSTEM_PROMPT = """You will be given the transactions from one merchant, with summary stats.
+
+Questions:
+1. Is this a recurring payment? (yes/no)
+2. Are these the SAME recurring transaction based on the notes and amounts? (yes/no)
+3. Frequency? (weekly/bi-weekly/monthly/quarterly/yearly/none)
+4. Is amount fixed or variable?
+5. When is next payment expected? (YYYY-MM-DD format)
+6. Confidence? (high/medium/low)
+
+Return JSON only:
+{
+  "is_recurring": true,
+  "same_transaction": true,
+  "frequency": "monthly",
+  "typical_amount": 2.26,
+  "amount_variance": "fixed",
+  "confidence": "high",
+  "next_expected_date": "2025-12-27",
+  "notes": "Description of the recurring pattern"
+}
+
+**CRITICAL:** Return ONLY the JSON object. No additional text."""
+
+
 def get_recurring_detection_prompt(
     merchant_key: str,
     merchant_name: str,
     category: str,
     transactions: List[Dict],
     stats: Dict
-) -> str:
+) -> Tuple[str, str]:
     """
     Generate a prompt for detecting recurring payment patterns.
 
@@ -27,17 +64,9 @@ def get_recurring_detection_prompt(
         stats: Pre-calculated statistics (count, avg_interval, amount_min/max, variance_pct)
 
     Returns:
-        Formatted prompt string
+        (system, user) prompt pair; only the user part varies between calls
     """
-    # Build transaction list
-    transaction_lines = []
-    for i, txn in enumerate(transactions, 1):
-        amount_str = f"${abs(txn['amount']):.2f}"
-        note_str = f' (note: "{txn["note"]}")' if txn.get("note") else ""
-        transaction_lines.append(
-            f"{i}. {txn['date']}: -{amount_str}{note_str}"
-        )
-    transactions_text = "\n".join(transaction_lines)
+    transactions_text = _format_transaction_lines(transactions)
 
     # Amount description
     if stats["amount_variance_pct"] == 0:
@@ -45,7 +74,7 @@ def get_recurring_detection_prompt(
     else:
         amount_desc = f"${stats['amount_min']:.2f} - ${stats['amount_max']:.2f} ({stats['amount_variance_pct']:.1f}% variance)"
 
-    prompt = f"""Analyze these transactions from "{merchant_name}":
+    user_prompt = f"""Analyze these transactions from "{merchant_name}":
 
 Transactions:
 {transactions_text}
@@ -54,36 +83,44 @@ Stats:
 - Count: {stats['count']} transactions
 - Average interval: {stats['avg_interval_days']:.0f} days
 - Amount: {amount_desc}
-- Category: {category}
+- Category: {category}"""
 
-Questions:
-1. Is this a recurring payment? (yes/no)
-2. Are these the SAME recurring transaction based on the notes and amounts? (yes/no)
-3. Frequency? (weekly/bi-weekly/monthly/quarterly/yearly/none)
-4. Is amount fixed or variable?
-5. When is next payment expected? (YYYY-MM-DD format)
-6. Confidence? (high/medium/low)
+    return RECURRING_DETECTION_SYSTEM_PROMPT, user_prompt
 
-Return JSON only:
-{{
-  "is_recurring": true,
-  "same_transaction": true,
-  "frequency": "monthly",
-  "typical_amount": 2.26,
-  "amount_variance": "fixed",
-  "confidence": "high",
-  "next_expected_date": "2025-12-27",
-  "notes": "Description of the recurring pattern"
-}}
 
-**CRITICAL:** Return ONLY the JSON object. No additional text."""
+# Instructions and response schema for the batch call (see RECURRING_DETECTION_SYSTEM_PROMPT)
+BATCH_RECURRING_DETECTION_SYSTEM_PROMPT = """You will be given several merchants, each with its transactions and summary stats.
+
+For EACH merchant, determine:
+1. Is this a recurring payment?
+2. Are transactions the SAME recurring bill (based on notes/amounts)?
+3. Frequency (weekly/bi-weekly/monthly/quarterly/yearly/none)
+4. Is amount fixed or variable?
+5. Next expected payment date
+6. Confidence level
+
+Return a JSON array with one object per merchant in order:
+[
+  {
+    "merchant_key": "MERCHANTKEY1",
+    "is_recurring": true,
+    "same_transaction": true,
+    "frequency": "monthly",
+    "typical_amount": 10.00,
+    "amount_variance": "fixed",
+    "confidence": "high",
+    "next_expected_date": "2025-12-15",
+    "notes": "Monthly subscription"
+  },
+  ...
+]
 
-    return prompt
+**CRITICAL:** Return ONLY the JSON array. No additional text."""
 
 
 def get_batch_recurring_detection_prompt(
     merchants: List[Dict]
-) -> str:
+) -> Tuple[str, str]:
     """
     Generate a prompt for batch detection of multiple merchants.
 
@@ -96,20 +133,12 @@ def get_batch_recurring_detection_prompt(
             - stats: Pre-calculated statistics
 
     Returns:
-        Formatted prompt string
+        (system, user) prompt pair; only the user part varies between calls
     """
     merchant_sections = []
 
     for idx, merchant in enumerate(merchants, 1):
-        # Build transaction list
-        transaction_lines = []
-        for i, txn in enumerate(merchant["transactions"], 1):
-            amount_str = f"${abs(txn['amount']):.2f}"
-            note_str = f' (note: "{txn["note"]}")' if txn.get("note") else ""
-            transaction_lines.append(
-                f"   {i}. {txn['date']}: -{amount_str}{note_str}"
-            )
-        transactions_text = "\n".join(transaction_lines)
+        transactions_text = _format_transaction_lines(merchant["transactions"], indent="   ")
 
         stats = merchant["stats"]
         if stats["amount_variance_pct"] == 0:
@@ -127,33 +156,7 @@ Stats: {stats['count']} transactions, avg interval {stats['avg_interval_days']:.
 
     merchants_text = "\n".join(merchant_sections)
 
-    prompt = f"""Analyze these merchants for recurring payment patterns:
-{merchants_text}
-
-For EACH merchant, determine:
-1. Is this a recurring payment?
-2. Are transactions the SAME recurring bill (based on notes/amounts)?
-3. Frequency (weekly/bi-weekly/monthly/quarterly/yearly/none)
-4. Is amount fixed or variable?
-5. Next expected payment date
-6. Confidence level
-
-Return a JSON array with one object per merchant in order:
-[
-  {{
-    "merchant_key": "MERCHANTKEY1",
-    "is_recurring": true,
-    "same_transaction": true,
-    "frequency": "monthly",
-    "typical_amount": 10.00,
-    "amount_variance": "fixed",
-    "confidence": "high",
-    "next_expected_date": "2025-12-15",
-    "notes": "Monthly subscription"
-  }},
-  ...
-]
-
-**CRITICAL:** Return ONLY the JSON array. No additional text."""
+    user_prompt = f"""Analyze these merchants for recurring payment patterns:
+{merchants_text}"""
 
-    return prompt
+    return BATCH_RECURRING_DETECTION_SYSTEM_PROMPT, user_prompt
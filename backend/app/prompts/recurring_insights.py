@@ -6,56 +6,23 @@ and generate actionable insights like cost summaries, optimization
 suggestions, anomaly detection, and predictions.
 """
 
-from typing import List, Dict
+from typing import List, Dict, Tuple
 from datetime import date
 
+# Payments per month for each frequency
+MONTHLY_MULTIPLIERS = {
+    "weekly": 4.33,
+    "bi-weekly": 2.17,
+    "monthly": 1,
+    "quarterly": 1/3,
+    "yearly": 1/12
+}
 
-def get_recurring_insights_prompt(
-    recurring_payments: List[Dict],
-    total_monthly_expenses: float,
-    total_monthly_income: float
-) -> str:
-    """
-    Generate a prompt for analyzing recurring payments and generating insights.
 
-    Args:
-        recurring_payments: List of recurring payment dicts with:
-            - merchant_name: Human-readable name
-            - category: Payment category
-            - frequency: weekly/bi-weekly/monthly/quarterly/yearly
-            - typical_amount: Typical payment amount (positive number)
-            - amount_variance: fixed/variable
-            - next_expected_date: Expected next payment date (optional)
-        total_monthly_expenses: Total monthly expenses for context
-        total_monthly_income: Total monthly income for context
-
-    Returns:
-        Formatted prompt string
-    """
-    # Build payment list
-    payment_lines = []
-    for i, payment in enumerate(recurring_payments, 1):
-        freq = payment.get("frequency", "monthly")
-        amount = abs(payment.get("typical_amount", 0))
-        variance = payment.get("amount_variance", "fixed")
-        next_date = payment.get("next_expected_date", "unknown")
-        category = payment.get("category", "Other")
-
-        payment_lines.append(
-            f"{i}. {payment['merchant_name']}: ${amount:.2f}/{freq} ({variance}) - {category}"
-            f" - Next: {next_date}"
-        )
-
-    payments_text = "\n".join(payment_lines)
-
-    prompt = f"""Analyze these recurring payments and generate insights:
-
-**Recurring Payments:**
-{payments_text}
-
-**Financial Context:**
-- Total Monthly Expenses: ${total_monthly_expenses:.2f}
-- Total Monthly Income: ${total_monthly_income:.2f}
+# Instructions and response schema shared by every insights call. They go in
+# the system message so the prompt prefix is identical across calls and
+# providers can serve it from their prompt cache.
+RECURRING_INSIGHTS_SYSTEM_PROMPT = """You will be given a user's recurring payments and their monthly income and expenses.
 
 **Generate insights in these categories:**
 
@@ -65,52 +32,52 @@ def get_recurring_insights_prompt(
 4. **Predictions**: Upcoming payment reminders and cash flow predictions
 
 **Response Format (JSON only):**
-{{
-  "summary": {{
+{
+  "summary": {
     "total_monthly": 150.00,
     "total_yearly": 1800.00,
     "count": 5,
     "percentage_of_expenses": 6.0,
-    "by_category": {{
+    "by_category": {
       "Subscription": 50.00,
       "Utilities": 100.00
-    }}
-  }},
+    }
+  },
   "insights": [
-    {{
+    {
       "type": "cost_analysis",
       "title": "Monthly Recurring Costs",
       "message": "You spend $150/month on recurring payments",
       "priority": "info"
-    }},
-    {{
+    },
+    {
       "type": "optimization",
       "title": "Streaming Services",
       "message": "Consider bundling Netflix + Disney+ for savings",
       "priority": "suggestion"
-    }},
-    {{
+    },
+    {
       "type": "anomaly",
       "title": "Unusual Charge",
       "message": "Your gym membership increased by 20%",
       "priority": "warning"
-    }},
-    {{
+    },
+    {
       "type": "prediction",
       "title": "High Expense Week",
       "message": "3 payments due next week totaling $85",
       "priority": "info"
-    }}
+    }
   ],
   "upcoming": [
-    {{
+    {
       "merchant": "Netflix",
       "amount": 15.99,
       "date": "2025-12-15",
       "days_until": 9
-    }}
+    }
   ]
-}}
+}
 
 **Important:**
 - Be concise but informative
@@ -121,62 +88,120 @@ def get_recurring_insights_prompt(
 
 **CRITICAL:** Return ONLY the JSON object. No additional text."""
 
-    return prompt
-
 
-def get_simple_insights_prompt(
-    recurring_payments: List[Dict]
-) -> str:
+def get_recurring_insights_prompt(
+    recurring_payments: List[Dict],
+    total_monthly_expenses: float,
+    total_monthly_income: float
+) -> Tuple[str, str]:
     """
-    Generate a simpler prompt when we don't have full financial context.
+    Generate a prompt for analyzing recurring payments and generating insights.
 
     Args:
-        recurring_payments: List of recurring payment dicts
+        recurring_payments: List of recurring payment dicts with:
+            - merchant_name: Human-readable name
+            - category: Payment category
+            - frequency: weekly/bi-weekly/monthly/quarterly/yearly
+            - typical_amount: Typical payment amount (positive number)
+            - amount_variance: fixed/variable
+            - next_expected_date: Expected next payment date (optional)
+        total_monthly_expenses: Total monthly expenses for context
+        total_monthly_income: Total monthly income for context
 
     Returns:
-        Formatted prompt string
+        (system, user) prompt pair; only the user part varies between calls
     """
     # Build payment list
     payment_lines = []
-    total = 0
-    for payment in recurring_payments:
-        amount = abs(payment.get("typical_amount", 0))
+    for i, payment in enumerate(recurring_payments, 1):
         freq = payment.get("frequency", "monthly")
-        total += amount if freq == "monthly" else amount / 12
+        amount = abs(payment.get("typical_amount", 0))
+        variance = payment.get("amount_variance", "fixed")
+        next_date = payment.get("next_expected_date", "unknown")
+        category = payment.get("category", "Other")
 
         payment_lines.append(
-            f"- {payment['merchant_name']}: ${amount:.2f}/{freq} ({payment.get('category', 'Other')})"
+            f"{i}. {payment['merchant_name']}: ${amount:.2f}/{freq} ({variance}) - {category}"
+            f" - Next: {next_date}"
         )
 
     payments_text = "\n".join(payment_lines)
 
-    prompt = f"""Analyze these recurring payments:
+    user_prompt = f"""Analyze these recurring payments and generate insights:
 
+**Recurring Payments:**
 {payments_text}
 
+**Financial Context:**
+- Total Monthly Expenses: ${total_monthly_expenses:.2f}
+- Total Monthly Income: ${total_monthly_income:.2f}"""
+
+    return RECURRING_INSIGHTS_SYSTEM_PROMPT, user_prompt
+
+
+# Instructions for the simpler insights call; the precomputed totals are sent
+# with the payments so this text stays the same on every call
+SIMPLE_INSIGHTS_SYSTEM_PROMPT = """You will be given a list of recurring payments and their precomputed totals.
+
 **Generate a brief summary with:**
 1. Total monthly cost
 2. Total yearly cost
 3. 1-2 optimization suggestions if any stand out
 4. Any unusual patterns
 
-Return JSON:
-{{
-  "summary": {{
-    "total_monthly": {total:.2f},
-    "total_yearly": {total * 12:.2f},
-    "count": {len(recurring_payments)}
-  }},
+Return JSON, copying the totals and count you were given into the summary:
+{
+  "summary": {
+    "total_monthly": 150.00,
+    "total_yearly": 1800.00,
+    "count": 5
+  },
   "insights": [
-    {{
+    {
       "type": "cost_analysis",
       "title": "Summary",
       "message": "Brief summary here",
       "priority": "info"
-    }}
+    }
   ]
-}}
+}
 
 **CRITICAL:** Return ONLY the JSON object."""
 
-    return prompt
+
+def get_simple_insights_prompt(
+    recurring_payments: List[Dict]
+) -> Tuple[str, str]:
+    """
+    Generate a simpler prompt when we don't have full financial context.
+
+    Args:
+        recurring_payments: List of recurring payment dicts
+
+    Returns:
+        (system, user) prompt pair; only the user part varies between calls
+    """
+    # Build payment list
+    payment_lines = []
+    for payment in recurring_payments:
+        amount = abs(payment.get("typical_amount", 0))
+        freq = payment.get("frequency", "monthly")
+        payment_lines.append(
+            f"- {payment['merchant_name']}: ${amount:.2f}/{freq} ({payment.get('category', 'Other')})"
+        )
+
+    payments_text = "\n".join(payment_lines)
+
+    # Monthly equivalent, using the same multipliers as calculate_monthly_amount
+    total = sum(
+        abs(payment.get("typical_amount", 0)) * MONTHLY_MULTIPLIERS.get(payment.get("frequency", "monthly"), 1)
+        for payment in recurring_payments
+    )
+
+    user_prompt = f"""Analyze these recurring payments:
+
+{payments_text}
+
+Totals: ${total:.2f}/month, ${total * 12:.2f}/year across {len(recurring_payments)} payments"""
+
+    return SIMPLE_INSIGHTS_SYSTEM_PROMPT, user_prompt
@@ -21,3 +21,20 @@ class UserResponse(BaseModel):
 
     class Config:
         from_attributes = True
+
+
+class AuthenticatedUser(BaseModel):
+    """Read-only snapshot of the signed-in user, resolved by the auth dependency."""
+    id: int
+    email: Optional[str] = None
+    name: Optional[str] = None
+    avatar_url: Optional[str] = None
+    google_id: Optional[str] = None
+    is_active: bool = True
+    is_demo: bool = False
+    created_at: datetime
+    updated_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+        frozen = True
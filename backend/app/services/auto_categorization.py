@@ -2,13 +2,14 @@
 AI-powered auto-categorization service using OpenAI client with OpenRouter.
 """
 
-import json
 import logging
 from typing import List, Dict, Optional
+import orjson
 from sqlalchemy.orm import Session
 from datetime import datetime
 from openai import OpenAI
 
+from app.core import cache
 from app.core.config import settings
 from app.models.transaction import Transaction
 from app.models.merchant_cache import MerchantCache
@@ -33,7 +34,7 @@ def get_openai_client() -> Optional[OpenAI]:
     return client
 
 
-async def categorize_transactions_batch(
+def categorize_transactions_batch(
     transaction_ids: List[int],
     db: Session,
     user_id: int,
@@ -42,6 +43,9 @@ async def categorize_transactions_batch(
     """
     Categorize multiple transactions using AI.
 
+    Blocking (database queries and the AI request); async callers should run
+    it in a worker thread.
+
     Args:
         transaction_ids: List of transaction IDs to categorize
         db: Database session
@@ -102,6 +106,7 @@ async def categorize_transactions_batch(
     # Commit cached updates
     if auto_apply and cached_results:
         db.commit()
+        cache.invalidate("dashboard", user_id)
 
     # If all transactions were cached, return early
     if not uncached_transactions:
@@ -147,7 +152,7 @@ async def categorize_transactions_batch(
 
     # Get AI categorization
     try:
-        ai_results = await _call_ai_for_categorization(client, txn_data, valid_categories)
+        ai_results = _call_ai_for_categorization(client, txn_data, valid_categories)
 
         # Process AI results
         ai_categorization_results = []
@@ -219,6 +224,7 @@ async def categorize_transactions_batch(
         if auto_apply:
             try:
                 db.commit()
+                cache.invalidate("dashboard", user_id)
             except Exception as commit_error:
                 db.rollback()
                 logger.error(f"Error committing AI categorization: {commit_error}", exc_info=True)
@@ -260,7 +266,7 @@ async def categorize_transactions_batch(
         }
 
 
-async def _call_ai_for_categorization(
+def _call_ai_for_categorization(
     client: OpenAI,
     transactions: List[Dict],
     categories: List[str]
@@ -303,20 +309,20 @@ async def _call_ai_for_categorization(
 
         if start_idx != -1 and end_idx > start_idx:
             json_str = content[start_idx:end_idx]
-            results = json.loads(json_str)
+            results = orjson.loads(json_str)
             return results
         else:
             # Couldn't find JSON array
             raise ValueError("No JSON array found in response")
 
-    except json.JSONDecodeError as e:
+    except orjson.JSONDecodeError as e:
         # If JSON parsing fails, return empty results
         logger.error(f"Failed to parse AI response: {e}")
         logger.error(f"Response content: {content}")
         return []
 
 
-async def categorize_single_transaction(
+def categorize_single_transaction(
     transaction_id: int,
     db: Session,
     user_id: int,
@@ -335,7 +341,7 @@ async def categorize_single_transaction(
         Categorization result
     """
     # Use batch function with single transaction
-    result = await categorize_transactions_batch(
+    result = categorize_transactions_batch(
         [transaction_id],
         db,
         user_id,
@@ -4,10 +4,11 @@ from typing import Dict, Optional, List
 from sqlalchemy.orm import Session
 from datetime import datetime
 
+from app.core import cache
 from app.core.config import settings
 from app.models.merchant_cache import MerchantCache
 from app.models.transaction import Transaction
-from app.models.user_category import UserCategory, DEFAULT_USER_CATEGORIES
+from app.models.user_category import UserCategory, DEFAULT_USER_CATEGORY_NAMES
 
 
 def get_user_categories(db: Session, user_id: int) -> List[str]:
@@ -15,7 +16,7 @@ def get_user_categories(db: Session, user_id: int) -> List[str]:
     Get list of category names for a user.
     If user has no categories, returns default category names.
     """
-    categories = db.query(UserCategory).filter(
+    categories = db.query(UserCategory.name).filter(
         UserCategory.user_id == user_id
     ).order_by(UserCategory.sort_order).all()
 
@@ -23,10 +24,10 @@ def get_user_categories(db: Session, user_id: int) -> List[str]:
         return [cat.name for cat in categories]
 
     # Return default names if user has no categories yet
-    return [cat["name"] for cat in DEFAULT_USER_CATEGORIES]
+    return list(DEFAULT_USER_CATEGORY_NAMES)
 
 
-async def categorize_merchant_with_ai(
+def categorize_merchant_with_ai(
     merchant_key: str,
     sample_descriptions: list[str],
     db: Session,
@@ -65,7 +66,7 @@ async def categorize_merchant_with_ai(
         return _get_stub_categorization(merchant_key)
 
     try:
-        result = await _call_openrouter(merchant_key, sample_descriptions, user_categories)
+        result = _call_openrouter(merchant_key, sample_descriptions, user_categories)
 
         # Save to cache
         cache_entry = MerchantCache(
@@ -88,6 +89,7 @@ async def categorize_merchant_with_ai(
         })
 
         db.commit()
+        cache.invalidate("dashboard", user_id)
 
         return {
             "merchant_key": merchant_key,
@@ -99,7 +101,7 @@ async def categorize_merchant_with_ai(
         return _get_stub_categorization(merchant_key)
 
 
-async def _call_openrouter(
+def _call_openrouter(
     merchant_key: str,
     sample_descriptions: list[str],
     categories: List[str]
@@ -124,8 +126,8 @@ Return ONLY valid JSON with keys: category, note, explanation.
 Example: {{"category": "Eating Out", "note": "Lunch - McDonald's", "explanation": "McDonald's is a fast food restaurant."}}
 """
 
-    async with httpx.AsyncClient(timeout=30.0) as client:
-        response = await client.post(
+    with httpx.Client(timeout=30.0) as client:
+        response = client.post(
             f"{settings.OPENROUTER_BASE_URL}/chat/completions",
             headers={
                 "Authorization": f"Bearer {settings.OPENROUTER_API_KEY}",
@@ -1,30 +1,61 @@
 import pandas as pd
 import logging
 from datetime import datetime
-from typing import Optional, Tuple, Dict, List
+from typing import Optional, Tuple, Dict, List, Union, BinaryIO, Iterator
+from sqlalchemy import insert
 from sqlalchemy.orm import Session
 from io import BytesIO
+from itertools import chain
 
+from app.core import cache
 from app.models.account import Account
 from app.models.transaction import Transaction
 from app.services.merchant_normalization import normalize_merchant
 
+# Rows parsed per chunk; each chunk is inserted before the next is read
+CSV_CHUNK_ROWS = 500
+
 logger = logging.getLogger(__name__)
 
 
+def _read_csv_chunks(file_content: Union[bytes, BinaryIO]) -> Iterator[pd.DataFrame]:
+    """
+    Read a CSV in fixed-size row chunks so large uploads aren't held in memory.
+
+    Accepts raw bytes or a binary file object (e.g. a spooled upload).
+    """
+    source = BytesIO(file_content) if isinstance(file_content, bytes) else file_content
+    return pd.read_csv(source, chunksize=CSV_CHUNK_ROWS)
+
+
+def _insert_transactions(db: Session, rows: List[Dict]) -> List[int]:
+    """
+    Insert a chunk of transaction rows in one multi-row INSERT and return their IDs.
+
+    Runs at the Core level, so no ORM objects or identity-map entries are created.
+    """
+    if not rows:
+        return []
+    return list(db.scalars(insert(Transaction).returning(Transaction.id), rows))
+
+
 def parse_rbc_csv(
-    file_content: bytes,
+    file_content: Union[bytes, BinaryIO],
     db: Session,
     user_id: int,
     account_id: Optional[int] = None
-) -> Tuple[int, int, int]:
+) -> Tuple[int, int, int, List[int]]:
     """
     Parse RBC-style CSV and import transactions.
 
-    Returns: (inserted_count, skipped_count, account_id)
+    Rows are read and inserted in chunks of CSV_CHUNK_ROWS and committed once
+    at the end, so memory stays flat regardless of file size.
+
+    Returns: (inserted_count, skipped_count, account_id, inserted_ids)
     """
-    # Read CSV with pandas
-    df = pd.read_csv(BytesIO(file_content))
+    # Read CSV with pandas; the first chunk provides columns and account details
+    chunks = _read_csv_chunks(file_content)
+    df = next(chunks)
 
     # Expected columns
     required_cols = ["Account Type", "Account Number", "Transaction Date",
@@ -37,6 +68,7 @@ def parse_rbc_csv(
 
     inserted_count = 0
     skipped_count = 0
+    inserted_ids = []
 
     # Get or create account
     if account_id is None:
@@ -64,98 +96,106 @@ def parse_rbc_csv(
             )
             db.add(account)
             db.commit()
-            db.refresh(account)
+            cache.invalidate("accounts", user_id)
+            cache.invalidate("dashboard", user_id)
+            cache.invalidate("analyze_merchants", user_id)
 
         account_id = account.id
 
-    # Process each transaction
-    for _, row in df.iterrows():
-        try:
-            # Parse date (format: MM/DD/YYYY)
-            transaction_date_str = str(row["Transaction Date"]).strip()
-            transaction_date = datetime.strptime(transaction_date_str, "%m/%d/%Y").date()
-
-            # Determine amount and currency
-            cad_amount = row.get("CAD$")
-            usd_amount = row.get("USD$")
+    # Process each transaction, one chunk at a time
+    for df in chain([df], chunks):
+        chunk_rows = []
+        for _, row in df.iterrows():
+            try:
+                # Parse date (format: MM/DD/YYYY)
+                transaction_date_str = str(row["Transaction Date"]).strip()
+                transaction_date = datetime.strptime(transaction_date_str, "%m/%d/%Y").date()
 
-            amount = None
-            currency = "CAD"
+                # Determine amount and currency
+                cad_amount = row.get("CAD$")
+                usd_amount = row.get("USD$")
 
-            if pd.notna(cad_amount) and cad_amount != "":
-                amount = float(cad_amount)
+                amount = None
                 currency = "CAD"
-            elif pd.notna(usd_amount) and usd_amount != "":
-                amount = float(usd_amount)
-                currency = "USD"
 
-            # Skip if no amount
-            if amount is None:
-                skipped_count += 1
-                continue
+                if pd.notna(cad_amount) and cad_amount != "":
+                    amount = float(cad_amount)
+                    currency = "CAD"
+                elif pd.notna(usd_amount) and usd_amount != "":
+                    amount = float(usd_amount)
+                    currency = "USD"
 
-            # Build description
-            desc1 = str(row["Description 1"]).strip() if pd.notna(row["Description 1"]) else ""
-            desc2 = str(row["Description 2"]).strip() if pd.notna(row["Description 2"]) else ""
-            description_raw = f"{desc1} {desc2}".strip()
-
-            if not description_raw:
-                skipped_count += 1
-                continue
+                # Skip if no amount
+                if amount is None:
+                    skipped_count += 1
+                    continue
 
-            # Normalize merchant
-            merchant_key = normalize_merchant(description_raw)
+                # Build description
+                desc1 = str(row["Description 1"]).strip() if pd.notna(row["Description 1"]) else ""
+                desc2 = str(row["Description 2"]).strip() if pd.notna(row["Description 2"]) else ""
+                description_raw = f"{desc1} {desc2}".strip()
 
-            # Create transaction
-            transaction = Transaction(
-                account_id=account_id,
-                user_id=user_id,
-                date=transaction_date,
-                description_raw=description_raw,
-                merchant_key=merchant_key,
-                amount=amount,
-                currency=currency,
-                category="Uncategorized",
-                category_source="uncategorized",
-                is_expense=amount < 0  # True for expenses (negative), False for income (positive)
-            )
+                if not description_raw:
+                    skipped_count += 1
+                    continue
 
-            db.add(transaction)
-            inserted_count += 1
+                # Normalize merchant
+                merchant_key = normalize_merchant(description_raw)
+
+                # Queue the transaction row for this chunk's insert
+                chunk_rows.append({
+                    "account_id": account_id,
+                    "user_id": user_id,
+                    "date": transaction_date,
+                    "description_raw": description_raw,
+                    "merchant_key": merchant_key,
+                    "amount": amount,
+                    "currency": currency,
+                    "category": "Uncategorized",
+                    "category_source": "uncategorized",
+                    "is_expense": amount < 0  # True for expenses (negative), False for income (positive)
+                })
+                inserted_count += 1
+
+            except Exception as e:
+                print(f"Error processing row: {e}")
+                skipped_count += 1
+                continue
 
-        except Exception as e:
-            print(f"Error processing row: {e}")
-            skipped_count += 1
-            continue
+        inserted_ids.extend(_insert_transactions(db, chunk_rows))
 
     # Commit all transactions
     db.commit()
 
-    return inserted_count, skipped_count, account_id
+    return inserted_count, skipped_count, account_id, inserted_ids
 
 
 def parse_csv_universal(
-    file_content: bytes,
+    file_content: Union[bytes, BinaryIO],
     format_config: Dict,
     db: Session,
     user_id: int,
     account_id: Optional[int] = None
-) -> Tuple[int, int, int]:
+) -> Tuple[int, int, int, List[int]]:
     """
     Parse any bank CSV using AI-detected format configuration.
 
     Args:
-        file_content: Raw CSV file content
+        file_content: Raw CSV file content or a binary file object
         format_config: Dictionary with column mappings from AI detection
         db: Database session
         user_id: Current user ID
         account_id: Optional existing account ID
 
-    Returns: (inserted_count, skipped_count, account_id)
+    Rows are read and inserted in chunks of CSV_CHUNK_ROWS and committed once
+    at the end.
+
+    Returns: (inserted_count, skipped_count, account_id, inserted_ids)
     """
-    # Read CSV with pandas
+    # Read CSV with pandas; the first chunk provides columns and account details
     try:
-        df = pd.read_csv(BytesIO(file_content))
+        chunks = _read_csv_chunks(file_content)
+        df = next(chunks)
     except Exception as e:
         logger.error(f"Error reading CSV: {e}")
         raise ValueError(f"Could not read CSV file: {e}")
@@ -181,6 +221,7 @@ def parse_csv_universal(
 
     inserted_count = 0
     skipped_count = 0
+    inserted_ids = []
 
     # Get or create account
     if account_id is None:
@@ -189,101 +230,103 @@ def parse_csv_universal(
             account_type_column, account_number_column
         )
 
-    # Process each row
-    for idx, row in df.iterrows():
-        try:
-            # Parse date
-            date_str = str(row[date_column]).strip()
-            if not date_str or date_str.lower() == 'nan':
-                skipped_count += 1
-                continue
-
+    # Process each row, one chunk at a time
+    for df in chain([df], chunks):
+        chunk_rows = []
+        for idx, row in df.iterrows():
             try:
-                transaction_date = datetime.strptime(date_str, date_format).date()
-            except ValueError:
-                # Try common alternative formats
-                transaction_date = _parse_date_flexible(date_str)
-                if not transaction_date:
-                    logger.warning(f"Could not parse date: {date_str}")
+                # Parse date
+                date_str = str(row[date_column]).strip()
+                if not date_str or date_str.lower() == 'nan':
                     skipped_count += 1
                     continue
 
-            # Parse amount
-            amount_str = str(row[amount_column]).strip()
-            amount_str = amount_str.replace(',', '').replace('$', '').replace('"', '')
+                try:
+                    transaction_date = datetime.strptime(date_str, date_format).date()
+                except ValueError:
+                    # Try common alternative formats
+                    transaction_date = _parse_date_flexible(date_str)
+                    if not transaction_date:
+                        logger.warning(f"Could not parse date: {date_str}")
+                        skipped_count += 1
+                        continue
+
+                # Parse amount
+                amount_str = str(row[amount_column]).strip()
+                amount_str = amount_str.replace(',', '').replace('$', '').replace('"', '')
+
+                if not amount_str or amount_str.lower() == 'nan':
+                    skipped_count += 1
+                    continue
 
-            if not amount_str or amount_str.lower() == 'nan':
-                skipped_count += 1
-                continue
+                try:
+                    amount = float(amount_str)
+                except ValueError:
+                    logger.warning(f"Could not parse amount: {amount_str}")
+                    skipped_count += 1
+                    continue
 
-            try:
-                amount = float(amount_str)
-            except ValueError:
-                logger.warning(f"Could not parse amount: {amount_str}")
-                skipped_count += 1
-                continue
+                # Handle amount sign based on format config
+                if amount_is_absolute and sign_column:
+                    sign_value = str(row.get(sign_column, "")).strip().lower()
+                    if sign_value in debit_indicators:
+                        amount = -abs(amount)  # Debit = expense = negative
+                    elif sign_value in credit_indicators:
+                        amount = abs(amount)  # Credit = income = positive
+                    # If sign_value not recognized, keep original
+
+                # Build description from configured columns
+                description_parts = []
+                for col in description_columns:
+                    if col in df.columns:
+                        val = row.get(col)
+                        if pd.notna(val) and str(val).strip():
+                            description_parts.append(str(val).strip())
+
+                description_raw = " ".join(description_parts)
+
+                if not description_raw:
+                    # Fallback: use first non-empty string column
+                    for col in df.columns:
+                        val = row.get(col)
+                        if pd.notna(val) and isinstance(val, str) and val.strip():
+                            description_raw = val.strip()
+                            break
+
+                if not description_raw:
+                    skipped_count += 1
+                    continue
 
-            # Handle amount sign based on format config
-            if amount_is_absolute and sign_column:
-                sign_value = str(row.get(sign_column, "")).strip().lower()
-                if sign_value in debit_indicators:
-                    amount = -abs(amount)  # Debit = expense = negative
-                elif sign_value in credit_indicators:
-                    amount = abs(amount)  # Credit = income = positive
-                # If sign_value not recognized, keep original
-
-            # Build description from configured columns
-            description_parts = []
-            for col in description_columns:
-                if col in df.columns:
-                    val = row.get(col)
-                    if pd.notna(val) and str(val).strip():
-                        description_parts.append(str(val).strip())
-
-            description_raw = " ".join(description_parts)
-
-            if not description_raw:
-                # Fallback: use first non-empty string column
-                for col in df.columns:
-                    val = row.get(col)
-                    if pd.notna(val) and isinstance(val, str) and val.strip():
-                        description_raw = val.strip()
-                        break
-
-            if not description_raw:
+                # Normalize merchant
+                merchant_key = normalize_merchant(description_raw)
+
+                # Queue the transaction row for this chunk's insert
+                chunk_rows.append({
+                    "account_id": account_id,
+                    "user_id": user_id,
+                    "date": transaction_date,
+                    "description_raw": description_raw,
+                    "merchant_key": merchant_key,
+                    "amount": amount,
+                    "currency": currency,
+                    "category": "Uncategorized",
+                    "category_source": "uncategorized",
+                    "is_expense": amount < 0
+                })
+                inserted_count += 1
+
+            except Exception as e:
+                logger.error(f"Error processing row {idx}: {e}")
                 skipped_count += 1
                 continue
 
-            # Normalize merchant
-            merchant_key = normalize_merchant(description_raw)
-
-            # Create transaction
-            transaction = Transaction(
-                account_id=account_id,
-                user_id=user_id,
-                date=transaction_date,
-                description_raw=description_raw,
-                merchant_key=merchant_key,
-                amount=amount,
-                currency=currency,
-                category="Uncategorized",
-                category_source="uncategorized",
-                is_expense=amount < 0
-            )
-
-            db.add(transaction)
-            inserted_count += 1
-
-        except Exception as e:
-            logger.error(f"Error processing row {idx}: {e}")
-            skipped_count += 1
-            continue
+        inserted_ids.extend(_insert_transactions(db, chunk_rows))
 
     # Commit all transactions
     db.commit()
 
     logger.info(f"Universal parser: inserted={inserted_count}, skipped={skipped_count}")
-    return inserted_count, skipped_count, account_id
+    return inserted_count, skipped_count, account_id, inserted_ids
 
 
 def _get_or_create_account(
@@ -329,7 +372,9 @@ def _get_or_create_account(
         )
         db.add(account)
         db.commit()
-        db.refresh(account)
+        cache.invalidate("accounts", user_id)
+        cache.invalidate("dashboard", user_id)
+        cache.invalidate("analyze_merchants", user_id)
 
     return account.id
 
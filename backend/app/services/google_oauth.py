@@ -7,6 +7,7 @@ Handles the OAuth flow with Google including:
 """
 
 import httpx
+from functools import lru_cache
 from typing import Optional, Dict
 from urllib.parse import urlencode
 
@@ -18,10 +19,13 @@ GOOGLE_USERINFO_URL = "https://www.googleapis.com/oauth2/v2/userinfo"
 GOOGLE_AUTH_URL = "https://accounts.google.com/o/oauth2/v2/auth"
 
 
+@lru_cache(maxsize=1)
 def get_google_auth_url() -> Optional[str]:
     """
     Generate the Google OAuth authorization URL.
 
+    The URL depends only on static settings, so it is built once and memoized.
+
     Returns:
         The authorization URL or None if Google OAuth is not configured
     """
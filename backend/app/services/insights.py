@@ -6,7 +6,7 @@ from sqlalchemy.orm import Session
 from app.core.config import settings
 
 
-async def generate_insights_with_ai(
+def generate_insights_with_ai(
     aggregates: Dict[str, Any],
     sample_transactions: List[Dict[str, Any]],
     filters: Dict[str, Any]
@@ -20,13 +20,13 @@ async def generate_insights_with_ai(
         return _get_stub_insights(aggregates)
 
     try:
-        return await _call_openrouter_for_insights(aggregates, sample_transactions, filters)
+        return _call_openrouter_for_insights(aggregates, sample_transactions, filters)
     except Exception as e:
         print(f"Error calling OpenRouter for insights: {e}")
         return _get_stub_insights(aggregates)
 
 
-async def _call_openrouter_for_insights(
+def _call_openrouter_for_insights(
     aggregates: Dict[str, Any],
     sample_transactions: List[Dict[str, Any]],
     filters: Dict[str, Any]
@@ -56,8 +56,8 @@ Return ONLY valid JSON with key "insights" containing an array of insight string
 Example: {{"insights": ["Your total spending was $1234.56.", "Transport costs were lower than usual."]}}
 """
 
-    async with httpx.AsyncClient(timeout=30.0) as client:
-        response = await client.post(
+    with httpx.Client(timeout=30.0) as client:
+        response = client.post(
             f"{settings.OPENROUTER_BASE_URL}/chat/completions",
             headers={
                 "Authorization": f"Bearer {settings.OPENROUTER_API_KEY}",
@@ -8,25 +8,32 @@ This service detects recurring payment patterns by:
 4. Caching results for performance
 """
 
-import json
+import asyncio
 import logging
 from typing import List, Dict, Optional
 from datetime import datetime, timedelta, date
 from collections import defaultdict
+import orjson
 from sqlalchemy.orm import Session
 from sqlalchemy import func
 from openai import OpenAI
 
 from app.core.config import settings
+from app.core.llm_cache import cached_chat_completion
 from app.models.transaction import Transaction
 from app.models.recurring_cache import RecurringCache
-from app.prompts.recurring_detection import (
-    get_recurring_detection_prompt,
-    get_batch_recurring_detection_prompt
-)
+from app.prompts.recurring_detection import get_batch_recurring_detection_prompt
+from app.prompts.recurring_insights import MONTHLY_MULTIPLIERS
 
 logger = logging.getLogger("categorization")  # Use same log file
 
+# Merchants per detection prompt. Each prompt repeats the instructions once, so
+# larger batches are cheaper, but answer quality drops on very long lists.
+DETECTION_BATCH_SIZE = 8
+
+# Detection prompts in flight at once
+DETECTION_CONCURRENCY = 4
+
 
 def calculate_monthly_amount(amount: float, frequency: str) -> float:
     """
@@ -39,14 +46,7 @@ def calculate_monthly_amount(amount: float, frequency: str) -> float:
     Returns:
         Monthly equivalent amount
     """
-    multipliers = {
-        "weekly": 4.33,
-        "bi-weekly": 2.17,
-        "monthly": 1,
-        "quarterly": 1/3,
-        "yearly": 1/12
-    }
-    return amount * multipliers.get(frequency, 1)
+    return amount * MONTHLY_MULTIPLIERS.get(frequency, 1)
 
 
 def get_openai_client() -> Optional[OpenAI]:
@@ -188,6 +188,10 @@ async def detect_recurring_payments(
     """
     Detect recurring payments for a user.
 
+    The database phases run in worker threads via asyncio.to_thread, so a large
+    analysis doesn't stall the event loop; they run one after another, so the
+    session is never used by two threads at once.
+
     Args:
         user_id: User ID
         db: Database session
@@ -207,16 +211,56 @@ async def detect_recurring_payments(
 
     # If not force refresh, return cached results (expenses only)
     if not force_refresh:
-        cached = db.query(RecurringCache).filter(
-            RecurringCache.user_id == user_id,
-            RecurringCache.is_recurring == True,
-            RecurringCache.category != "Income"  # Exclude income entries
-        ).all()
-
+        cached = await asyncio.to_thread(_load_cached_detection, user_id, db)
         if cached:
             logger.info(f"Returning {len(cached)} cached recurring payments")
-            return [_cache_to_dict(c) for c in cached]
+            return cached
+
+    merchants_to_analyze = await asyncio.to_thread(
+        _collect_merchant_candidates, user_id, db, min_occurrences, lookback_days
+    )
+    if not merchants_to_analyze:
+        return []
+
+    # Call AI for verification
+    client = get_openai_client()
+    if not client:
+        logger.warning("No OpenRouter API key - using algorithm-only detection")
+        return await asyncio.to_thread(_algorithm_only_detection, merchants_to_analyze, user_id, db)
 
+    try:
+        ai_results = await _call_ai_for_detection(
+            client, merchants_to_analyze, use_cache=not force_refresh
+        )
+        return await asyncio.to_thread(_process_ai_results, ai_results, merchants_to_analyze, user_id, db)
+    except Exception as e:
+        logger.error(f"AI detection failed: {e}", exc_info=True)
+        return await asyncio.to_thread(_algorithm_only_detection, merchants_to_analyze, user_id, db)
+
+
+def _load_cached_detection(user_id: int, db: Session) -> List[Dict]:
+    """Cached recurring expense payments (excludes the Income category)."""
+    cached = db.query(RecurringCache).filter(
+        RecurringCache.user_id == user_id,
+        RecurringCache.is_recurring == True,
+        RecurringCache.category != "Income"  # Exclude income entries
+    ).all()
+    return [_cache_to_dict(c) for c in cached]
+
+
+def _collect_merchant_candidates(
+    user_id: int,
+    db: Session,
+    min_occurrences: int,
+    lookback_days: int
+) -> List[Dict]:
+    """
+    Group recent expense transactions by merchant and compute their stats.
+
+    Returns:
+        Merchant dicts (merchant_key, merchant_name, category, transactions,
+        stats) for merchants with at least min_occurrences transactions
+    """
     # Get expense transactions within lookback period (expenses only - negative amounts)
     cutoff_date = datetime.utcnow().date() - timedelta(days=lookback_days)
 
@@ -248,9 +292,6 @@ async def detect_recurring_payments(
 
     logger.info(f"Found {len(candidates)} merchants with {min_occurrences}+ transactions")
 
-    if not candidates:
-        return []
-
     # Prepare data for AI analysis
     merchants_to_analyze = []
     for merchant_key, txns in candidates.items():
@@ -268,51 +309,84 @@ async def detect_recurring_payments(
             "stats": stats
         })
 
-    # Call AI for verification
-    client = get_openai_client()
-    if not client:
-        logger.warning("No OpenRouter API key - using algorithm-only detection")
-        return _algorithm_only_detection(merchants_to_analyze, user_id, db)
-
-    try:
-        ai_results = await _call_ai_for_detection(client, merchants_to_analyze)
-        return _process_ai_results(ai_results, merchants_to_analyze, user_id, db)
-    except Exception as e:
-        logger.error(f"AI detection failed: {e}", exc_info=True)
-        return _algorithm_only_detection(merchants_to_analyze, user_id, db)
+    return merchants_to_analyze
 
 
 async def _call_ai_for_detection(
     client: OpenAI,
-    merchants: List[Dict]
+    merchants: List[Dict],
+    use_cache: bool = True
 ) -> List[Dict]:
     """
     Call OpenRouter API to detect recurring patterns.
 
+    Merchants are sent DETECTION_BATCH_SIZE per prompt, with up to
+    DETECTION_CONCURRENCY prompts in flight.
+
     Args:
         client: OpenAI client
         merchants: List of merchant data with transactions
+        use_cache: Whether identical prompts may be answered from the LLM cache
 
     Returns:
-        List of AI detection results
+        List of AI detection results, each tagged with its merchant_key
     """
-    logger.info(f"Calling AI to analyze {len(merchants)} merchants...")
-
-    # Use batch prompt for efficiency
-    prompt = get_batch_recurring_detection_prompt(merchants)
-
-    response = client.chat.completions.create(
-        model=settings.OPENROUTER_MODEL,
-        messages=[
-            {
-                "role": "user",
-                "content": prompt
-            }
-        ],
-        extra_body={"reasoning": {"enabled": True}}
-    )
+    batches = [
+        merchants[i:i + DETECTION_BATCH_SIZE]
+        for i in range(0, len(merchants), DETECTION_BATCH_SIZE)
+    ]
+    logger.info(f"Calling AI to analyze {len(merchants)} merchants in {len(batches)} batches...")
+
+    semaphore = asyncio.Semaphore(DETECTION_CONCURRENCY)
+    batch_results = await asyncio.gather(*[
+        _call_ai_for_detection_batch(client, batch, semaphore, use_cache)
+        for batch in batches
+    ])
+    return [result for results in batch_results for result in results]
+
 
-    content = response.choices[0].message.content
+async def _call_ai_for_detection_batch(
+    client: OpenAI,
+    merchants: List[Dict],
+    semaphore: asyncio.Semaphore,
+    use_cache: bool = True
+) -> List[Dict]:
+    """
+    Run one batched detection prompt.
+
+    Args:
+        client: OpenAI client
+        merchants: The merchants in this batch
+        semaphore: Limits concurrent requests
+        use_cache: Whether an identical prompt may be answered from the LLM cache
+
+    Returns:
+        List of AI detection results for this batch
+    """
+    system_prompt, user_prompt = get_batch_recurring_detection_prompt(merchants)
+
+    async with semaphore:
+        # The OpenAI client is synchronous, so keep the request off the event loop.
+        # Identical prompts (unchanged merchants) are answered from the LLM cache
+        # unless the caller forced a refresh.
+        content = await asyncio.to_thread(
+            cached_chat_completion,
+            client,
+            [
+                # Static instructions first so the prefix is cacheable by the provider
+                {
+                    "role": "system",
+                    "content": system_prompt
+                },
+                {
+                    "role": "user",
+                    "content": user_prompt
+                }
+            ],
+            use_cache=use_cache,
+            temperature=0,
+            extra_body={"reasoning": {"enabled": True}}
+        )
 
     # Parse JSON response
     try:
@@ -321,14 +395,14 @@ async def _call_ai_for_detection(
 
         if start_idx != -1 and end_idx > start_idx:
             json_str = content[start_idx:end_idx]
-            results = json.loads(json_str)
+            results = orjson.loads(json_str)
             logger.info(f"AI returned {len(results)} results")
             return results
         else:
             logger.error("No JSON array found in AI response")
             return []
 
-    except json.JSONDecodeError as e:
+    except orjson.JSONDecodeError as e:
         logger.error(f"Failed to parse AI response: {e}")
         logger.error(f"Response content: {content[:500]}")
         return []
@@ -381,6 +455,7 @@ def _process_ai_results(
             cache_entry.is_recurring = is_recurring
             cache_entry.frequency = result.get("frequency")
             cache_entry.typical_amount = abs(result.get("typical_amount") or 0)
+            cache_entry.monthly_amount = calculate_monthly_amount(cache_entry.typical_amount, cache_entry.frequency)
             cache_entry.amount_variance = result.get("amount_variance", "variable")
             cache_entry.confidence = result.get("confidence", "low")
             cache_entry.ai_verified = True
@@ -443,6 +518,9 @@ def _process_ai_results(
                 is_recurring=is_recurring,
                 frequency=result.get("frequency"),
                 typical_amount=abs(result.get("typical_amount") or 0),
+                monthly_amount=calculate_monthly_amount(
+                    abs(result.get("typical_amount") or 0), result.get("frequency")
+                ),
                 amount_variance=result.get("amount_variance", "variable"),
                 confidence=result.get("confidence", "low"),
                 category=merchant["category"],
@@ -527,6 +605,7 @@ def _algorithm_only_detection(
                 cache_entry.is_recurring = True
                 cache_entry.frequency = frequency
                 cache_entry.typical_amount = stats["amount_min"]
+                cache_entry.monthly_amount = calculate_monthly_amount(stats["amount_min"], frequency)
                 cache_entry.amount_variance = "fixed" if stats["amount_variance_pct"] < 5 else "variable"
                 cache_entry.confidence = "medium"
                 cache_entry.ai_verified = False
@@ -543,6 +622,7 @@ def _algorithm_only_detection(
                     is_recurring=True,
                     frequency=frequency,
                     typical_amount=stats["amount_min"],
+                    monthly_amount=calculate_monthly_amount(stats["amount_min"], frequency),
                     amount_variance="fixed" if stats["amount_variance_pct"] < 5 else "variable",
                     confidence="medium",
                     category=merchant["category"],
@@ -569,18 +649,19 @@ def _algorithm_only_detection(
 
 
 def _cache_to_dict(cache: RecurringCache) -> Dict:
-    """Convert cache entry to dict."""
+    """Convert cache entry to dict. Dates are kept as date objects."""
     return {
         "merchant_key": cache.merchant_key,
         "merchant_name": cache.merchant_name or cache.merchant_key,
         "category": cache.category or "Other",
         "frequency": cache.frequency or "monthly",
         "typical_amount": cache.typical_amount or 0,
+        "monthly_amount": cache.monthly_amount or 0,
         "amount_variance": cache.amount_variance or "variable",
         "confidence": cache.confidence or "low",
         "transaction_count": cache.transaction_count or 0,
-        "last_transaction_date": cache.last_transaction_date.isoformat() if cache.last_transaction_date else None,
-        "next_expected_date": cache.next_expected_date.isoformat() if cache.next_expected_date else None,
+        "last_transaction_date": cache.last_transaction_date,
+        "next_expected_date": cache.next_expected_date,
         "ai_notes": cache.ai_notes
     }
 
@@ -639,8 +720,8 @@ def get_upcoming_payments(
         result.append({
             "merchant_key": cache.merchant_key,
             "merchant_name": cache.merchant_name or cache.merchant_key,
-            "amount": cache.typical_amount or 0,
-            "expected_date": cache.next_expected_date.isoformat(),
+            "amount": cache.typical_amount or 0.0,
+            "expected_date": cache.next_expected_date,
             "days_until": days_until
         })
 
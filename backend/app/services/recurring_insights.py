@@ -8,20 +8,23 @@ This service generates insights about recurring payments including:
 - Upcoming payment predictions
 """
 
-import json
+import asyncio
 import logging
 from typing import List, Dict, Optional
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 from collections import defaultdict
+import orjson
 from sqlalchemy.orm import Session
 from sqlalchemy import func
 from openai import OpenAI
 
 from app.core.config import settings
+from app.core.llm_cache import cached_chat_completion
 from app.models.transaction import Transaction
 from app.models.recurring_cache import RecurringCache
 from app.models.recurring_insights import RecurringInsights
 from app.prompts.recurring_insights import (
+    MONTHLY_MULTIPLIERS,
     get_recurring_insights_prompt,
     get_simple_insights_prompt
 )
@@ -120,20 +123,14 @@ def calculate_monthly_amount(amount: float, frequency: str) -> float:
     Returns:
         Monthly equivalent amount
     """
-    multipliers = {
-        "weekly": 4.33,
-        "bi-weekly": 2.17,
-        "monthly": 1,
-        "quarterly": 1/3,
-        "yearly": 1/12
-    }
-    return amount * multipliers.get(frequency, 1)
+    return amount * MONTHLY_MULTIPLIERS.get(frequency, 1)
 
 
 async def generate_recurring_insights(
     user_id: int,
     db: Session,
-    recurring_payments: Optional[List[Dict]] = None
+    recurring_payments: Optional[List[Dict]] = None,
+    use_cache: bool = True
 ) -> Dict:
     """
     Generate AI insights about recurring payments.
@@ -142,6 +139,7 @@ async def generate_recurring_insights(
         user_id: User ID
         db: Database session
         recurring_payments: Optional pre-fetched recurring payments
+        use_cache: Whether an identical prompt may be answered from the LLM cache
 
     Returns:
         Dict with summary, insights, and upcoming payments
@@ -205,7 +203,8 @@ async def generate_recurring_insights(
                 client,
                 recurring_payments,
                 total_monthly_expenses,
-                total_monthly_income
+                total_monthly_income,
+                use_cache=use_cache
             )
         except Exception as e:
             logger.error(f"AI insights failed: {e}", exc_info=True)
@@ -223,7 +222,8 @@ async def _get_ai_insights(
     client: OpenAI,
     recurring_payments: List[Dict],
     total_monthly_expenses: float,
-    total_monthly_income: float
+    total_monthly_income: float,
+    use_cache: bool = True
 ) -> Dict:
     """
     Get AI-generated insights.
@@ -233,31 +233,41 @@ async def _get_ai_insights(
         recurring_payments: List of recurring payments
         total_monthly_expenses: Total monthly expenses
         total_monthly_income: Total monthly income
+        use_cache: Whether an identical prompt may be answered from the LLM cache
 
     Returns:
         Dict with insights
     """
     logger.info(f"Calling AI for insights on {len(recurring_payments)} recurring payments...")
 
-    prompt = get_recurring_insights_prompt(
+    system_prompt, user_prompt = get_recurring_insights_prompt(
         recurring_payments,
         total_monthly_expenses,
         total_monthly_income
     )
 
-    response = client.chat.completions.create(
-        model=settings.OPENROUTER_MODEL,
-        messages=[
+    # The OpenAI client is synchronous, so keep the request off the event loop.
+    # Identical prompts (unchanged payments) are answered from the LLM cache
+    # unless the caller forced a refresh.
+    content = await asyncio.to_thread(
+        cached_chat_completion,
+        client,
+        [
+            # Static instructions first so the prefix is cacheable by the provider
+            {
+                "role": "system",
+                "content": system_prompt
+            },
             {
                 "role": "user",
-                "content": prompt
+                "content": user_prompt
             }
         ],
+        use_cache=use_cache,
+        temperature=0,
         extra_body={"reasoning": {"enabled": True}}
     )
 
-    content = response.choices[0].message.content
-
     # Parse JSON response
     try:
         start_idx = content.find('{')
@@ -265,7 +275,7 @@ async def _get_ai_insights(
 
         if start_idx != -1 and end_idx > start_idx:
             json_str = content[start_idx:end_idx]
-            result = json.loads(json_str)
+            result = orjson.loads(json_str)
 
             # Add generated_at timestamp
             result["generated_at"] = datetime.utcnow().isoformat()
@@ -276,7 +286,7 @@ async def _get_ai_insights(
             logger.error("No JSON object found in AI response")
             raise ValueError("No JSON in response")
 
-    except json.JSONDecodeError as e:
+    except orjson.JSONDecodeError as e:
         logger.error(f"Failed to parse AI response: {e}")
         logger.error(f"Response content: {content[:500]}")
         raise
@@ -346,7 +356,7 @@ def _generate_basic_insights(
     for p in recurring_payments:
         if p.get("next_expected_date"):
             try:
-                next_date = datetime.strptime(p["next_expected_date"], "%Y-%m-%d").date()
+                next_date = date.fromisoformat(p["next_expected_date"])
                 days_until = (next_date - today).days
                 if 0 <= days_until <= 14:
                     upcoming.append({
@@ -5,9 +5,43 @@ Run after starting the server with: python run.py
 """
 import requests
 import json
+import uuid
+from datetime import date, timedelta
 from pathlib import Path
 
 BASE_URL = "http://localhost:8000"
+TEST_PASSWORD = "test-password-123"
+
+# Throwaway account shared by the authenticated tests (see _auth_headers)
+_auth = {}
+
+
+def _auth_headers():
+    """Sign up a fresh user once, give it some transactions, and return its auth header"""
+    if "headers" not in _auth:
+        email = f"test-{uuid.uuid4().hex[:12]}@example.com"
+        response = requests.post(
+            f"{BASE_URL}/api/v1/auth/signup",
+            json={"email": email, "password": TEST_PASSWORD}
+        )
+        response.raise_for_status()
+        headers = {"Authorization": f"Bearer {response.json()['token']['access_token']}"}
+
+        # Two per day, so pages split between rows sharing a date
+        for i in range(20):
+            requests.post(
+                f"{BASE_URL}/api/v1/transactions/",
+                json={
+                    "date": (date.today() - timedelta(days=i // 2)).isoformat(),
+                    "amount": -(i + 1.0),
+                    "description": f"TEST MERCHANT {i}"
+                },
+                headers=headers
+            ).raise_for_status()
+
+        _auth["email"] = email
+        _auth["headers"] = headers
+    return _auth["headers"]
 
 
 def test_health():
@@ -104,6 +138,203 @@ def test_categorize_merchant():
         return False
 
 
+def test_keyset_pagination():
+    """Test cursor pagination visits every row once and ends with a null next_cursor"""
+    print("📑 Testing keyset pagination...")
+    headers = _auth_headers()
+    url = f"{BASE_URL}/api/v1/transactions/view"
+
+    response = requests.get(url, params={"page_size": 7}, headers=headers)
+    data = response.json()
+    total_count = data["pagination"]["total_count"]
+    seen = [row["id"] for row in data["rows"]]
+
+    while data["pagination"]["next_cursor"]:
+        cursor = data["pagination"]["next_cursor"]
+        data = requests.get(url, params={
+            "page_size": 7,
+            "cursor_date": cursor["date"],
+            "cursor_id": cursor["id"]
+        }, headers=headers).json()
+        seen.extend(row["id"] for row in data["rows"])
+
+    # An exactly full last page must not advertise another page
+    full_page = requests.get(url, params={"page_size": total_count}, headers=headers).json()
+
+    # Half a cursor is rejected rather than silently paging by OFFSET
+    half_cursor = requests.get(url, params={"cursor_id": seen[0]}, headers=headers)
+
+    print(f"   Rows visited: {len(seen)} of {total_count}")
+    print(f"   Full single page next_cursor: {full_page['pagination']['next_cursor']}")
+    print(f"   Half cursor status: {half_cursor.status_code}\n")
+    return (
+        len(seen) == total_count
+        and len(set(seen)) == len(seen)
+        and full_page["pagination"]["next_cursor"] is None
+        and half_cursor.status_code == 422
+    )
+
+
+def test_etag_not_modified():
+    """Test /transactions/view and /categories answer a matching If-None-Match with 304"""
+    print("🏷️  Testing ETag / 304 responses...")
+    headers = _auth_headers()
+    view_url = f"{BASE_URL}/api/v1/transactions/view"
+
+    view = requests.get(view_url, params={"page_size": 5}, headers=headers)
+    view_etag = view.headers["ETag"]
+    view_cached = requests.get(
+        view_url, params={"page_size": 5}, headers={**headers, "If-None-Match": view_etag}
+    )
+
+    categories = requests.get(f"{BASE_URL}/api/v1/categories", headers=headers)
+    categories_cached = requests.get(
+        f"{BASE_URL}/api/v1/categories",
+        headers={**headers, "If-None-Match": categories.headers["ETag"]}
+    )
+
+    # A write must change the ETag
+    first_id = view.json()["rows"][0]["id"]
+    requests.patch(
+        f"{BASE_URL}/api/v1/transactions/{first_id}/note",
+        json={"note_user": "etag check"},
+        headers=headers
+    ).raise_for_status()
+    view_after_write = requests.get(
+        view_url, params={"page_size": 5}, headers={**headers, "If-None-Match": view_etag}
+    )
+
+    print(f"   View: {view_cached.status_code}, after write: {view_after_write.status_code}")
+    print(f"   Categories: {categories_cached.status_code}\n")
+    return (
+        view_cached.status_code == 304
+        and categories_cached.status_code == 304
+        and view_after_write.status_code == 200
+    )
+
+
+def test_category_rename():
+    """Test renaming a category moves its transactions to the new name"""
+    print("✏️  Testing category rename...")
+    headers = _auth_headers()
+    suffix = uuid.uuid4().hex[:6]
+    old_name, new_name = f"Pets {suffix}", f"Animals {suffix}"
+
+    category = requests.post(
+        f"{BASE_URL}/api/v1/categories", json={"name": old_name}, headers=headers
+    )
+    category.raise_for_status()
+    transaction = requests.post(
+        f"{BASE_URL}/api/v1/transactions/",
+        json={
+            "date": date.today().isoformat(),
+            "amount": -42.0,
+            "description": "PET STORE",
+            "category": old_name
+        },
+        headers=headers
+    )
+    transaction.raise_for_status()
+
+    response = requests.put(
+        f"{BASE_URL}/api/v1/categories/{category.json()['id']}",
+        json={"name": new_name},
+        headers=headers
+    )
+
+    def ids_in(name):
+        rows = requests.get(
+            f"{BASE_URL}/api/v1/transactions/view",
+            params={"category": name},
+            headers=headers
+        ).json()["rows"]
+        return [row["id"] for row in rows]
+
+    old_ids, new_ids = ids_in(old_name), ids_in(new_name)
+    print(f"   Status: {response.status_code}")
+    print(f"   Under old name: {len(old_ids)}, under new name: {len(new_ids)}\n")
+    return response.status_code == 200 and not old_ids and new_ids == [transaction.json()["id"]]
+
+
+def test_batch_delete_chunked():
+    """Test batch delete across several IN-list chunks deletes only the user's rows"""
+    print("🗑️  Testing chunked batch delete...")
+    from app.api.v1.transactions import DELETE_CHUNK_SIZE
+
+    headers = _auth_headers()
+    created = []
+    for amount in (-1.0, -2.0):
+        response = requests.post(
+            f"{BASE_URL}/api/v1/transactions/",
+            json={"date": date.today().isoformat(), "amount": amount, "description": "DELETE ME"},
+            headers=headers
+        )
+        response.raise_for_status()
+        created.append(response.json()["id"])
+
+    # Pad with ids that don't exist so the real ones land in the last chunk
+    missing = list(range(10**9, 10**9 + 2 * DELETE_CHUNK_SIZE))
+    response = requests.delete(
+        f"{BASE_URL}/api/v1/transactions/batch",
+        json=missing + created,
+        headers=headers
+    )
+
+    print(f"   Status: {response.status_code}")
+    print(f"   Response: {response.json()}\n")
+    return response.status_code == 200 and response.json()["deleted_count"] == len(created)
+
+
+def test_login_rehash():
+    """Test login still works and hashes at another bcrypt cost are flagged for upgrade"""
+    print("🔐 Testing login and password rehash...")
+    from passlib.context import CryptContext
+    from app.core.config import settings
+    from app.core.security import verify_and_update_password, verify_password
+
+    _auth_headers()
+    logins = [
+        requests.post(
+            f"{BASE_URL}/api/v1/auth/login",
+            json={"email": _auth["email"], "password": TEST_PASSWORD}
+        ).status_code
+        for _ in range(2)
+    ]
+
+    # A hash made at a different cost verifies and comes back upgraded
+    other_rounds = 4 if settings.BCRYPT_ROUNDS != 4 else 5
+    old_hash = CryptContext(schemes=["bcrypt"], bcrypt__rounds=other_rounds).hash(TEST_PASSWORD)
+    valid, new_hash = verify_and_update_password(TEST_PASSWORD, old_hash)
+    wrong = verify_and_update_password("wrong-password", old_hash)
+    current = verify_and_update_password(TEST_PASSWORD, new_hash) if new_hash else (False, None)
+
+    print(f"   Logins: {logins}")
+    print(f"   Old-cost hash upgraded: {new_hash is not None}\n")
+    return (
+        logins == [200, 200]
+        and valid
+        and new_hash is not None
+        and f"${settings.BCRYPT_ROUNDS:02d}$" in new_hash
+        and verify_password(TEST_PASSWORD, new_hash)
+        and wrong == (False, None)
+        and current == (True, None)
+    )
+
+
+def test_weekly_monthly_amount():
+    """Test weekly payments convert to 4.33 payments a month everywhere"""
+    print("📅 Testing weekly monthly-amount conversion...")
+    from app.services import recurring_detection, recurring_insights
+
+    amounts = [
+        recurring_detection.calculate_monthly_amount(10, "weekly"),
+        recurring_insights.calculate_monthly_amount(10, "weekly")
+    ]
+
+    print(f"   Monthly amounts for $10/week: {amounts}\n")
+    return all(abs(amount - 43.3) < 1e-9 for amount in amounts)
+
+
 def main():
     """Run all tests"""
     print("=" * 60)
@@ -126,6 +357,12 @@ def main():
         ("Upload CSV", test_upload_csv),
         ("Get Transactions", test_get_transactions),
         ("AI Categorization", test_categorize_merchant),
+        ("Keyset Pagination", test_keyset_pagination),
+        ("ETag / 304", test_etag_not_modified),
+        ("Category Rename", test_category_rename),
+        ("Chunked Batch Delete", test_batch_delete_chunked),
+        ("Login Rehash", test_login_rehash),
+        ("Weekly Monthly Amount", test_weekly_monthly_amount),
     ]
 
     results = []